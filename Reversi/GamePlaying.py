@@ -4,20 +4,43 @@
 #   folder "player" under the same path with this file
 # The player functions must have a function (x,y) = player(Colour, Board)
 from Reversi import *
+from registry import LazyPlayer
+from rating import Ratings, RankShift
+from gamerecord import GameArchive, EncodeGame
+import Reversi
 import random, os, sys
+import hashlib
 import importlib
+import json
+import csv
 import time
 import datetime
 from math import log
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 
 from openpyxl import Workbook, load_workbook
 
-# 创建日志文件
-log_filename = f"game_log_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-log_file = open(log_filename, 'w')
+play_round = 1#100
+play_workers = 1 # number of worker processes, 1 plays all games in this process
+play_sandbox = False # True runs every player in its own process, cut off at TimeLimit
+play_journal = 'tournament.journal' # finished games, to resume an interrupted tournament
+play_cache = 'results.cache' # results of earlier tournaments by the content of the players
+play_profile = None # file for the statistics of every move (CSV), None for no profiling
+play_profile_memory = False # True measures the peak memory of every move, slowing the players down
+play_warn = 0.5 # a move taking this part of TimeLimit is reported as close to the limit
+play_results = 'results.csv' # every game appended as it finishes, the reports are made from it
+play_archive = 'games.rec' # the moves of every game played, to replay them with gamerecord.py, None for no archive
+play_rating = False # True chooses the games by the ratings of the players instead of a round robin
+play_rating_stable = 3 # the rating mode stops when no player moves more than one place in this many batches
+play_rating_min = 10 # and every player has played this number of games
 
 old_stdout = sys.stdout
 
+# path and files
+players_path = sys.path[0]+'\\players'
+sys.path.append(players_path)
+
 # 同时输出到控制台和日志文件的函数
 def log_print(*args, **kwargs):
     # 保存原始的end和sep值
@@ -39,240 +62,705 @@ def blockPrint():
 def enablePrint():
     sys.stdout = old_stdout
 
-# path and files
-sys.path.append(sys.path[0]+'\\players')
-FileNames = [x for x in os.listdir('players') if x.endswith(".py")]
-StudentList = [x.strip('.py') for x in os.listdir('players')
-               if x.endswith(".py") and x.startswith('D') and len(x) == 15]
+# the games of the round robin in the order they are played: PlayerWhite,
+# PlayerBlack and round, the player functions are given by their index
+def game_list():
+    games = []
+    for i in range(len(pk_player)):
+        for j in range(i+1, len(pk_player)):
+            for round in range(play_round):
+                games.append((j, i, round))
+            for round in range(play_round):
+                games.append((i, j, round))
+    return games
 
-wb = Workbook()
-ws = wb.active
-StartTime = datetime.datetime.now()
+# to load the player functions in a worker process
+def worker_init(path, players):
+    global worker_function
+    sys.path.append(path)
+    blockPrint()
+    worker_function = {}
+    for player in players:
+        worker_function[player] = load_player(path, player)
 
-# 记录游戏开始时间到日志文件
-log_print(f"游戏开始时间: {StartTime.strftime('%Y-%m-%d %H:%M:%S')}")
+# to get the player function of a module, imported before its first game,
+# in sandbox mode the function runs in its own process
+def load_player(path, player):
+    return LazyPlayer(path, player, Sandbox=play_sandbox)
 
-play_round = 1#100
-pk_function = []
-pk_player = []
-pk_time = []
-for k in range(len(StudentList)):
-    play = importlib.util.find_spec(StudentList[k])
-    if (play is not None):
+# to import the player modules of a game, out of the time of the game: None
+# when both are imported, otherwise the result and the error message of the
+# game, a module which cannot be imported being a player error
+def import_players(white_function, black_function):
+    for (function, code) in [(white_function, PlayerError), (black_function, -PlayerError)]:
         try:
-            log_print(f"loading player function from {StudentList[k]}")
-            play = importlib.import_module(StudentList[k])
-            pk_function.append(play.player)
-            pk_player.append(StudentList[k])
-            pk_time.append(0)
+            function.Load()
         except Exception as e:
-            log_print(f"exception happen when loading player function from {StudentList[k]}\                \r\n the exception is {e}")
-            buf = [str(e)]
-            ws.append(buf)
-log_print(f"Loaded players are: {pk_player}", f"Total number of players is: {len(pk_player)}")
-buf = ['student']
-buf.extend(pk_player)
-ws.append(buf)
-
-buf = []
-buf1 = []
-mark = []
-timecount = []
-illegal_player = []
-slow_player = []
-error_player = []
-error_message = []
-
-for i in range(len(pk_function)):
-    buf.append([])
-    mark.append([])
-    for j in range(len(pk_function)):
-        mark[i].append(0)
-for i in range(len(pk_function)):
-    buf[i].append(pk_player[i])
-    for j in range(i+1, len(pk_function)):
-        if illegal_player.count(i) > 0:
-            break
-        if slow_player.count(i) >0:
-            break
-        if error_player.count(i) >0:
+            return code, 'import error: ' + str(e)
+    return None
+
+# to play a game in a worker process, with the import time of the players
+def worker_play(white, black):
+    moves = []
+    failed = import_players(worker_function[white], worker_function[black])
+    if failed is not None:
+        result, error = failed
+        PlayTime = [0, 0]
+    else:
+        Board, result, PlayTime, error = PlayGame(worker_function[white],
+                                                  worker_function[black],
+                                                  Hook=moves.append,
+                                                  TraceMemory=play_profile_memory)
+    imports = (worker_function[white].ImportTime, worker_function[black].ImportTime)
+    return result, PlayTime, error, moves, imports
+
+# to start the pool of worker processes
+def start_pool(workers):
+    return ProcessPoolExecutor(workers, initializer=worker_init,
+                               initargs=(players_path, pk_player))
+
+# to send games (white, black, round) to the pool of worker processes
+def start_games(pool, game_list):
+    games = {}
+    for (white, black, round) in game_list:
+        if known_game(white, black, round) is not None:
+            continue
+        games[(white, black, round)] = pool.submit(worker_play, pk_player[white],
+                                                   pk_player[black])
+    return games
+
+# to read the games of a journal: the games finished before an interruption
+# by the player names, or the results cache by the player hashes. The times
+# of the moves are None for a game written without them.
+def read_journal(filename):
+    finished = {}
+    if not os.path.exists(filename):
+        return finished
+    with open(filename, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue # the last line may be cut by the interruption
+            finished[(record['white'], record['black'], record['round'])] = \
+                (record['result'], record['time'], record['error'], record.get('latency'))
+    return finished
+
+# to open the journal for appending the games finished from now on
+def open_journal(filename):
+    cut = False
+    if os.path.exists(filename) and os.path.getsize(filename) > 0:
+        with open(filename, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            cut = f.read(1) != b'\n'
+    journal = open(filename, 'a', encoding='utf-8')
+    if cut:
+        journal.write('\n')
+    return journal
+
+# to append a game to a journal, with the times of its moves as given by
+# game_latency
+def write_journal(journal, white, black, round, result, PlayTime, error, times):
+    journal.write(json.dumps({'white': white, 'black': black, 'round': round,
+                              'result': result, 'time': PlayTime, 'error': error,
+                              'latency': times}) + '\n')
+    journal.flush()
+
+# the hash of a player: the content of its file and of the Reversi module,
+# a game between two players with known hashes does not need to be played
+def player_hash(player):
+    h = hashlib.sha1()
+    with open(Reversi.__file__, 'rb') as f:
+        h.update(f.read())
+    with open(os.path.join('players', player + '.py'), 'rb') as f:
+        h.update(f.read())
+    return h.hexdigest()
+
+# a game lost because a player module cannot be imported, no move is played
+def import_failure(error):
+    return str(error).startswith('import error: ')
+
+# a result depending on the load of the machine, which is not kept in the
+# results cache: a slow move, or a failed import (it may be cut off at its
+# time limit, and trying a broken module again costs little)
+def timing_result(result, error):
+    return abs(result) == PlayerSlow or import_failure(error)
+
+# to get the result of a game played before: from the journal of an
+# interrupted run or from the results cache, None for a new game. Such
+# results in a cache written before are played again.
+def known_game(white, black, round):
+    key = (pk_player[white], pk_player[black], round)
+    if key in finished:
+        return finished[key]
+    known = cached.get((pk_hash[white], pk_hash[black], round))
+    if known is not None and timing_result(known[0], known[2]):
+        return None
+    return known
+
+# the phase of a game by the number of empty cells before the move
+def game_phase(empties):
+    if empties > 40:
+        return 'opening'
+    elif empties > 14:
+        return 'midgame'
+    return 'endgame'
+
+# the phases of a game, as named by game_phase
+game_phases = ['opening', 'midgame', 'endgame']
+
+# the columns of the profile file
+profile_fields = ['white', 'black', 'round', 'player', 'colour', 'move', 'empties',
+                  'phase', 'x', 'y', 'wall', 'cpu', 'memory', 'error']
+
+# the times of the moves of a game by phase, for PlayerWhite and PlayerBlack,
+# to keep them in the journal and the results cache (to the microsecond)
+def game_latency(moves):
+    times = [{phase: [] for phase in game_phases} for colour in range(2)]
+    for stats in moves:
+        if stats['ErrCode'] == NoMove:
+            continue # a pass, the player was not called
+        side = 0 if stats['Colour'] == White else 1
+        times[side][game_phase(stats['Empties'])].append(float('%.6f' % stats['WallTime']))
+    return times
+
+# to add the times of the moves of a game to the latency of the players by phase
+def add_latency(white, black, times):
+    for (player, phases) in [(white, times[0]), (black, times[1])]:
+        for phase in game_phases:
+            latency[player][phase].extend(phases.get(phase, []))
+
+# to write the statistics of the moves of a game to the profile file
+def record_moves(white, black, round, moves):
+    if play_profile is None:
+        return
+    for stats in moves:
+        if stats['ErrCode'] == NoMove:
+            continue # a pass, the player was not called
+        player = white if stats['Colour'] == White else black
+        profile.writerow([pk_player[white], pk_player[black], round, pk_player[player],
+                          'white' if stats['Colour'] == White else 'black',
+                          stats['MoveNumber'], stats['Empties'], game_phase(stats['Empties']),
+                          stats['Move'][0], stats['Move'][1], stats['WallTime'],
+                          stats['CPUTime'], stats['PeakMemory'], stats['ErrCode']])
+    profile_file.flush()
+
+# a percentile of sorted values
+def percentile(values, p):
+    return values[min(len(values)-1, int(len(values)*p/100))]
+
+# the distribution of the time of a move: [moves, p50, p90, p99, max]
+def latency_stats(times):
+    times = sorted(times)
+    if len(times) == 0:
+        return [0, None, None, None, None]
+    return [len(times), percentile(times, 50), percentile(times, 90),
+            percentile(times, 99), times[-1]]
+
+# the columns of the results log
+results_fields = ['white', 'black', 'round', 'result', 'white_time', 'black_time', 'error']
+
+# to open the results log for the games of this run
+def open_results(filename):
+    results_file = open(filename, 'w', newline='', encoding='utf-8')
+    results = csv.writer(results_file)
+    results.writerow(results_fields)
+    results_file.flush()
+    return results_file, results
+
+# to get the marks of the players from the results log: 3 for a win and 1
+# for a draw in mark[winner][loser], and no mark at all for a player with
+# an illegal move, an error or a slow move
+def read_marks(filename, players):
+    index = {player: i for (i, player) in enumerate(players)}
+    mark = [[0]*len(players) for player in players]
+    out = set()
+    with open(filename, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            white = index[row['white']]
+            black = index[row['black']]
+            result = int(row['result'])
+            if result in (IllegalMove, PlayerError, PlayerSlow):
+                out.add(white)
+            elif -result in (IllegalMove, PlayerError, PlayerSlow):
+                out.add(black)
+            elif result > 0:
+                mark[black][white] = mark[black][white] + 3
+            elif result < 0:
+                mark[white][black] = mark[white][black] + 3
+            else:
+                mark[white][black] = mark[white][black] + 1
+                mark[black][white] = mark[black][white] + 1
+    for i in out:
+        for j in range(len(players)):
+            mark[i][j] = 0
+            mark[j][i] = 0
+    return mark
+
+# to save a workbook, under another name if the file cannot be written (it
+# is open in Excel for example), which is reported in the log
+def save_workbook(wb, filename):
+    try:
+        wb.save(filename)
+    except OSError as e:
+        name, ext = os.path.splitext(filename)
+        other = name + datetime.datetime.now().strftime('_%Y%m%d_%H%M%S') + ext
+        log_print(f"ERROR: {filename} cannot be saved ({e}), it is saved as {other} instead")
+        filename = other
+        wb.save(filename)
+    log_print(f"{filename} is saved")
+
+# to play the games chosen by the ratings of the players: in every batch
+# the players are paired where the ratings are the most uncertain and each
+# pair plays a game with both colours, until the ranking is stable or as
+# many games as in the round robin are played. A player with an illegal
+# move, an error or a slow move is disqualified as in the round robin.
+def rating_games():
+    ratings = Ratings(len(pk_player))
+    played = {}
+    ranking = None
+    stable = 0
+    total = 0
+    limit = len(game_list())
+    batch_number = 0
+    while total < limit:
+        active = [i for i in range(len(pk_player)) if i not in
+                  illegal_player + slow_player + error_player]
+        batch = []
+        for (i, j) in ratings.Pairs(active):
+            for (white, black) in [(i, j), (j, i)]:
+                batch.append((white, black, played.get((white, black), 0)))
+                played[(white, black)] = played.get((white, black), 0) + 1
+        if len(batch) == 0:
             break
-        start = time.time()
-        for round in range(play_round):
-            if illegal_player.count(j) > 0:
-                break
-            if slow_player.count(j) >0:
-                break
-            if error_player.count(j) >0:
-                break
-            blockPrint()
-            Board, result, PlayTime, error = PlayGame(pk_function[j], pk_function[i])
-            enablePrint()
-            pk_time[j] = pk_time[j] + PlayTime[0]
-            pk_time[i] = pk_time[i] + PlayTime[1]
-            if result == PlayerSlow:
-                log_print(pk_player[j], 'is a slow player')
-                slow_player.append(j)
-                mark[i][j] = 0
-                break
-            elif result == PlayerError:
-                log_print(pk_player[j], 'has error', error)
-                error_player.append(j)
-                error_message.append(error)
-                mark[i][j] = 0
-                break
-            elif result == IllegalMove:
-                log_print(pk_player[j], 'illegal move')
-                illegal_player.append(j)
-                mark[i][j] = 0
-                break
-            elif result == -PlayerSlow:
-                log_print(pk_player[i], 'is a slow player')
-                slow_player.append(i)
-                mark[j][i] = 0
-                break
-            elif result == -IllegalMove:
-                log_print(pk_player[i], 'illegal move')
-                illegal_player.append(i)
-                mark[j][i] = 0
-                break
-            elif result == -PlayerError:
-                log_print(pk_player[i], 'has error', error)
-                error_player.append(i)
-                error_message.append(error)
-                mark[j][i] = 0
-                break
+        if pool is not None:
+            games.update(start_games(pool, batch))
+        for (white, black, round) in batch:
+            if white not in active or black not in active:
+                continue
+            result, PlayTime, error = play_game(white, black, round)
+            total = total + 1
+            pk_time[white] = pk_time[white] + PlayTime[0]
+            pk_time[black] = pk_time[black] + PlayTime[1]
+            out = None
+            for (player, code) in [(white, result), (black, -result)]:
+                if code == PlayerSlow:
+                    log_print(pk_player[player], 'is a slow player')
+                    slow_player.append(player)
+                elif code == IllegalMove:
+                    log_print(pk_player[player], 'illegal move')
+                    illegal_player.append(player)
+                elif code == PlayerError:
+                    log_print(pk_player[player], 'has error', error)
+                    error_player.append(player)
+                    error_message.append(error)
+                else:
+                    continue
+                out = player
+            if out is not None:
+                active.remove(out)
             elif result > 0:
-                mark[i][j] = mark[i][j] + 3
+                ratings.Add(black, white, 1)
             elif result < 0:
-                mark[j][i] = mark[j][i] + 3
-            elif result == 0:
-                mark[i][j] = mark[i][j] + 1
-                mark[j][i] = mark[j][i] + 1
-        for round in range(play_round):
-            if illegal_player.count(j) != 0 or slow_player.count(j) != 0 \
-               or error_player.count(j) != 0:
-                break
+                ratings.Add(black, white, 0)
+            else:
+                ratings.Add(black, white, 0.5)
+        ratings.Fit()
+        batch_number = batch_number + 1
+        new_ranking = ratings.Ranking(active)
+        if ranking is not None and sorted(ranking) == sorted(new_ranking) \
+           and RankShift(ranking, new_ranking) <= 1:
+            stable = stable + 1
+        else:
+            stable = 0
+        ranking = new_ranking
+        log_print(f"batch {batch_number}: {total} games, best", pk_player[ranking[0]] if ranking else '-',
+                  '%.0f' % ratings.Rating[ranking[0]] if ranking else '', f"stable for {stable} batches")
+        if stable >= play_rating_stable and \
+           min([ratings.Played(i) for i in ranking] + [play_rating_min]) >= play_rating_min:
+            break
+    log_print(f"rating mode: {total} games played, {limit} in the round robin")
+    return ratings
+
+# to report the module of a player which cannot be imported, from the
+# result of its first game, in the log and in the rows of load_errors
+def record_import_error(white, black, result, error):
+    if not import_failure(error):
+        return
+    player = white if result == PlayerError else black
+    if import_failed[player]:
+        return
+    import_failed[player] = True
+    message = str(error)[len('import error: '):]
+    log_print(f"exception happen when loading player function from {pk_player[player]}\                \r\n the exception is {message}")
+    load_errors.append([message])
+
+# to get the result of a game: a known game, from the worker processes in
+# the parallel mode, otherwise the game is played here. Every new result is
+# appended to the journal and to the results cache at once, with the times
+# of its moves, and every game to the results log. The moves of the games
+# played are added to the archive, but not a game lost at the import of a
+# player, which has no move. The times of the moves of every game, known or
+# played, are added to the latency of the players.
+def play_game(white, black, round):
+    known = known_game(white, black, round)
+    if known is not None:
+        result, PlayTime, error, times = known
+        if times is not None:
+            add_latency(white, black, times)
+    else:
+        if (white, black, round) in games:
+            result, PlayTime, error, moves, imports = games.pop((white, black, round)).result()
+        else:
+            moves = []
             blockPrint()
-            Board, result, PlayTime, error = PlayGame(pk_function[i], pk_function[j])
+            failed = import_players(pk_function[white], pk_function[black])
+            if failed is not None:
+                result, error = failed
+                PlayTime = [0, 0]
+            else:
+                Board, result, PlayTime, error = PlayGame(pk_function[white], pk_function[black],
+                                                          Hook=moves.append,
+                                                          TraceMemory=play_profile_memory)
             enablePrint()
-            pk_time[j] = pk_time[j] + PlayTime[1]
-            pk_time[i] = pk_time[i] + PlayTime[0]
-            if result == PlayerSlow:
-                log_print(pk_player[i], 'is a slow player')
-                slow_player.append(i)
-                mark[j][i] = 0
-                break
-            elif result == IllegalMove:
-                log_print(pk_player[i], 'illegal move')
-                illegal_player.append(i)
-                mark[j][i] = 0
-                break
-            elif result == PlayerError:
-                log_print(pk_player[i], 'has error', error)
-                error_player.append(i)
-                error_message.append(error)
-                mark[j][i] = 0
-                break
-            elif result == -PlayerSlow:
-                log_print(pk_player[j], 'is a slow player')
-                slow_player.append(j)
-                mark[i][j] = 0
-                break
-            elif result == -IllegalMove:
-                log_print(pk_player[j], 'illegal move')
-                illegal_player.append(j)
-                mark[i][j] = 0
-                break
-            elif result == -PlayerError:
-                log_print(pk_player[j], 'has error', error)
-                error_player.append(j)
-                error_message.append(error)
-                mark[i][j] = 0
-                break
-            elif result < 0:
-                mark[i][j] = mark[i][j] + 3
-            elif result > 0:
-                mark[j][i] = mark[j][i] + 3
-            elif result == 0:
-                mark[i][j] = mark[i][j] + 1
-                mark[j][i] = mark[j][i] + 1
-        log_print(pk_player[i]+'('+ "%.5f" %  pk_time[i], 's) vs ',
-              pk_player[j]+'('+ '%.5f' %  pk_time[j], 's)',
-              #'%.5f' % (time.time()-start),
-              mark[i][j], ':', mark[j][i])
-        
-for i in (error_player + illegal_player + slow_player):
-    for j in range(len(pk_function)):
-        mark[i][j] = 0
-        mark[j][i] = 0    
-
-for i in range(len(pk_function)):
-    buf[i].extend(mark[i])
-    ws.append(buf[i])
-try:
-    wb.save("sample.xlsx")
-    log_print("sample.xlsx is saved")
-except:
-    wb.save("sample1.xlsx")
-    log_print("sample1.xlsx is saved")
-
-TotalTime = sum(pk_time)
-log_print('Total Time PK time is:', '%.2f' % TotalTime)
-
-pk_time_average = sum(pk_time)/len(pk_time)
-pk_time_max = max(pk_time)
-pk_time_min = min(pk_time)
-EndTime = datetime.datetime.now()
-TimeUsed = EndTime - StartTime
-TimeUsedSec = TimeUsed.seconds
-TimeUsedHour = TimeUsedSec // 3600
-TimeUsedSec = TimeUsedSec % 3600
-TimeUsedMin = TimeUsedSec // 60
-TimeUsedSec = TimeUsedSec % 60
-TimeStamp = 'Started at: ' + str(StartTime)[0:19] + '; ' + str(play_round) + \
-            ' trails; Time consumed: %02.0f' % TimeUsedHour + ':' + \
-            '%02.0f' % TimeUsedMin + ':' + '%03.1f' % TimeUsedSec
-log_print(TimeStamp)
-
-# 记录游戏结束时间到日志文件
-log_print(f"游戏结束时间: {EndTime.strftime('%Y-%m-%d %H:%M:%S')}")
-
-wb = Workbook()
-ws = wb.active
-#ws.append([TimeStamp, len(pk_function)])
-ws.append(['Student', 'Time Percentage', 'Time Used', 'Time Rank', 'Factor', 'Score',
-           'Score Rank', 'Final', 'Final Rank', 'Remark'])
-
-for i in range(len(pk_function)):
-    Remark = ' '
-    log_print(pk_player[i], " time percetage:", '%.3f' % (pk_time[i]/TotalTime*100), " time:", '%.5f' % pk_time[i])
-    score = sum(buf[i][1:len(buf[i])])
-    if illegal_player.count(i) > 0 or slow_player.count(i) > 0 \
-       or error_player.count(i) >0 :
-        factor = 1
-        score = 0
+            imports = (pk_function[white].ImportTime, pk_function[black].ImportTime)
+        # the first import of a module is kept, a worker process imports it
+        # again, and a module which cannot be imported has no import time
+        for (player, seconds) in [(white, imports[0]), (black, imports[1])]:
+            if import_time[player] is None and seconds is not None:
+                import_time[player] = seconds
+                log_print(f"{pk_player[player]} is imported in {seconds:.3f} s")
+        times = game_latency(moves)
+        add_latency(white, black, times)
+        record_moves(white, black, round, moves)
+        if play_archive is not None and not import_failure(error):
+            archive.Append(pk_player[white], pk_player[black], round, result, EncodeGame(moves))
+        write_journal(journal, pk_player[white], pk_player[black], round,
+                      result, PlayTime, error, times)
+        if not timing_result(result, error):
+            write_journal(cache, pk_hash[white], pk_hash[black], round,
+                          result, PlayTime, error, times)
+    record_import_error(white, black, result, error)
+    results.writerow([pk_player[white], pk_player[black], round, result,
+                      PlayTime[0], PlayTime[1], error])
+    results_file.flush()
+    return result, PlayTime, error
+
+if __name__ == '__main__':
+    # 创建日志文件
+    log_filename = f"game_log_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+    log_file = open(log_filename, 'w')
+
+    # path and files
+    FileNames = [x for x in os.listdir('players') if x.endswith(".py")]
+    StudentList = [x.strip('.py') for x in os.listdir('players')
+                   if x.endswith(".py") and x.startswith('D') and len(x) == 15]
+
+    # the import errors of the player modules, one row each for sample.xlsx
+    load_errors = []
+    StartTime = datetime.datetime.now()
+
+    # 记录游戏开始时间到日志文件
+    log_print(f"游戏开始时间: {StartTime.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    pk_function = []
+    pk_player = []
+    pk_time = []
+    for k in range(len(StudentList)):
+        play = importlib.util.find_spec(StudentList[k])
+        if (play is not None):
+            log_print(f"registering player function from {StudentList[k]}, imported before its first game")
+            pk_function.append(load_player(players_path, StudentList[k]))
+            pk_player.append(StudentList[k])
+            pk_time.append(0)
+    log_print(f"Loaded players are: {pk_player}", f"Total number of players is: {len(pk_player)}")
+    # the time used to import every player module, None until it is imported
+    # and for a module which cannot be imported
+    import_time = [None for player in pk_player]
+    # the players whose module cannot be imported, reported once
+    import_failed = [False for player in pk_player]
+
+    buf1 = []
+    mark = []
+    timecount = []
+    illegal_player = []
+    slow_player = []
+    error_player = []
+    error_message = []
+
+    finished = read_journal(play_journal)
+    if len(finished) > 0:
+        log_print(f"{len(finished)} finished games are read from {play_journal}")
+    journal = open_journal(play_journal)
+    pk_hash = [player_hash(player) for player in pk_player]
+    cached = read_journal(play_cache)
+    cache = open_journal(play_cache)
+    all_games = game_list()
+    new_games = [game for game in all_games if known_game(*game) is None]
+    log_print(f"{len(new_games)} of {len(all_games)} games are not in {play_journal} or {play_cache}")
+
+    if play_profile is not None:
+        profile_file = open(play_profile, 'w', newline='', encoding='utf-8')
+        profile = csv.writer(profile_file)
+        profile.writerow(profile_fields)
+    results_file, results = open_results(play_results)
+    if play_archive is not None:
+        archive = GameArchive(play_archive, Append=True)
+        log_print(f"the moves of the games are added to {play_archive}, games {archive.Count} on")
+    log_print(f"the results of the games are appended to {play_results}")
+    # the time of every move by player and phase, of the games played in this
+    # run and of the known games from the journal or the results cache
+    latency = [{phase: array('d') for phase in game_phases} for player in pk_player]
+
+    games = {}
+    pool = None
+    if play_workers > 1:
+        pool = start_pool(play_workers)
+        if not play_rating:
+            games = start_games(pool, game_list())
+
+    for i in range(len(pk_function)):
+        mark.append([])
+        for j in range(len(pk_function)):
+            mark[i].append(0)
+    if play_rating:
+        ratings = rating_games()
     else:
-        factor = log(pk_time_average/pk_time[i]+10, 10)
-    final = score * factor
-    buf1 = [pk_player[i], str(pk_time[i]/TotalTime*100), pk_time[i], '=rank(c' + str(i+2) + ', c2:c80,1)',
-            factor, score, '=rank(f' + str(i+2) + ', f2:f80)', final, '=rank(h' + str(i+2) + ', h2:h80)']
-    if illegal_player.count(i) > 0:
-        Remark = Remark + 'Illegal Move '
-    elif slow_player.count(i) > 0:
-        Remark = Remark + 'Slow Player '
-    elif error_player.count(i) > 0:
-        Remark = Remark + 'Error: ' + str(error_message[error_player.index(i)])
-    buf1.append(Remark)
-    ws.append(buf1)
-buf = []
-try:
-    wb.save("time.xlsx")
-    log_print("result saved in time.xlsx")
-except:
-    wb.save("time1.xlsx")
-    log_print("result saved in time1.xlsx")
-
-# 关闭日志文件
-log_print(f"日志文件已保存为: {log_filename}")
-log_file.close()
+        for i in range(len(pk_function)):
+            for j in range(i+1, len(pk_function)):
+                if illegal_player.count(i) > 0:
+                    break
+                if slow_player.count(i) >0:
+                    break
+                if error_player.count(i) >0:
+                    break
+                start = time.time()
+                for round in range(play_round):
+                    if illegal_player.count(j) > 0:
+                        break
+                    if slow_player.count(j) >0:
+                        break
+                    if error_player.count(j) >0:
+                        break
+                    result, PlayTime, error = play_game(j, i, round)
+                    pk_time[j] = pk_time[j] + PlayTime[0]
+                    pk_time[i] = pk_time[i] + PlayTime[1]
+                    if result == PlayerSlow:
+                        log_print(pk_player[j], 'is a slow player')
+                        slow_player.append(j)
+                        mark[i][j] = 0
+                        break
+                    elif result == PlayerError:
+                        log_print(pk_player[j], 'has error', error)
+                        error_player.append(j)
+                        error_message.append(error)
+                        mark[i][j] = 0
+                        break
+                    elif result == IllegalMove:
+                        log_print(pk_player[j], 'illegal move')
+                        illegal_player.append(j)
+                        mark[i][j] = 0
+                        break
+                    elif result == -PlayerSlow:
+                        log_print(pk_player[i], 'is a slow player')
+                        slow_player.append(i)
+                        mark[j][i] = 0
+                        break
+                    elif result == -IllegalMove:
+                        log_print(pk_player[i], 'illegal move')
+                        illegal_player.append(i)
+                        mark[j][i] = 0
+                        break
+                    elif result == -PlayerError:
+                        log_print(pk_player[i], 'has error', error)
+                        error_player.append(i)
+                        error_message.append(error)
+                        mark[j][i] = 0
+                        break
+                    elif result > 0:
+                        mark[i][j] = mark[i][j] + 3
+                    elif result < 0:
+                        mark[j][i] = mark[j][i] + 3
+                    elif result == 0:
+                        mark[i][j] = mark[i][j] + 1
+                        mark[j][i] = mark[j][i] + 1
+                for round in range(play_round):
+                    if illegal_player.count(j) != 0 or slow_player.count(j) != 0 \
+                       or error_player.count(j) != 0:
+                        break
+                    result, PlayTime, error = play_game(i, j, round)
+                    pk_time[j] = pk_time[j] + PlayTime[1]
+                    pk_time[i] = pk_time[i] + PlayTime[0]
+                    if result == PlayerSlow:
+                        log_print(pk_player[i], 'is a slow player')
+                        slow_player.append(i)
+                        mark[j][i] = 0
+                        break
+                    elif result == IllegalMove:
+                        log_print(pk_player[i], 'illegal move')
+                        illegal_player.append(i)
+                        mark[j][i] = 0
+                        break
+                    elif result == PlayerError:
+                        log_print(pk_player[i], 'has error', error)
+                        error_player.append(i)
+                        error_message.append(error)
+                        mark[j][i] = 0
+                        break
+                    elif result == -PlayerSlow:
+                        log_print(pk_player[j], 'is a slow player')
+                        slow_player.append(j)
+                        mark[i][j] = 0
+                        break
+                    elif result == -IllegalMove:
+                        log_print(pk_player[j], 'illegal move')
+                        illegal_player.append(j)
+                        mark[i][j] = 0
+                        break
+                    elif result == -PlayerError:
+                        log_print(pk_player[j], 'has error', error)
+                        error_player.append(j)
+                        error_message.append(error)
+                        mark[i][j] = 0
+                        break
+                    elif result < 0:
+                        mark[i][j] = mark[i][j] + 3
+                    elif result > 0:
+                        mark[j][i] = mark[j][i] + 3
+                    elif result == 0:
+                        mark[i][j] = mark[i][j] + 1
+                        mark[j][i] = mark[j][i] + 1
+                log_print(pk_player[i]+'('+ "%.5f" %  pk_time[i], 's) vs ',
+                      pk_player[j]+'('+ '%.5f' %  pk_time[j], 's)',
+                      #'%.5f' % (time.time()-start),
+                      mark[i][j], ':', mark[j][i])
+    # games of disqualified players are not needed anymore
+    for game in games.values():
+        game.cancel()
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+    # the reports are made from the results log, streamed to write-only workbooks
+    results_file.close()
+    mark = read_marks(play_results, pk_player)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet')
+    for buf in load_errors:
+        ws.append(buf)
+    ws.append(['student'] + pk_player)
+    for i in range(len(pk_function)):
+        ws.append([pk_player[i]] + mark[i])
+    save_workbook(wb, "sample.xlsx")
+
+    TotalTime = sum(pk_time)
+    log_print('Total Time PK time is:', '%.2f' % TotalTime)
+
+    pk_time_average = sum(pk_time)/len(pk_time)
+    pk_time_max = max(pk_time)
+    pk_time_min = min(pk_time)
+    EndTime = datetime.datetime.now()
+    TimeUsed = EndTime - StartTime
+    TimeUsedSec = TimeUsed.seconds
+    TimeUsedHour = TimeUsedSec // 3600
+    TimeUsedSec = TimeUsedSec % 3600
+    TimeUsedMin = TimeUsedSec // 60
+    TimeUsedSec = TimeUsedSec % 60
+    TimeStamp = 'Started at: ' + str(StartTime)[0:19] + '; ' + str(play_round) + \
+                ' trails; Time consumed: %02.0f' % TimeUsedHour + ':' + \
+                '%02.0f' % TimeUsedMin + ':' + '%03.1f' % TimeUsedSec
+    log_print(TimeStamp)
+
+    # 记录游戏结束时间到日志文件
+    log_print(f"游戏结束时间: {EndTime.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet')
+    #ws.append([TimeStamp, len(pk_function)])
+    ws.append(['Student', 'Time Percentage', 'Time Used', 'Time Rank', 'Factor', 'Score',
+               'Score Rank', 'Final', 'Final Rank', 'Remark', 'Import Time'])
+
+    for i in range(len(pk_function)):
+        Remark = ' '
+        log_print(pk_player[i], " time percetage:", '%.3f' % (pk_time[i]/TotalTime*100), " time:", '%.5f' % pk_time[i])
+        score = sum(mark[i])
+        if illegal_player.count(i) > 0 or slow_player.count(i) > 0 \
+           or error_player.count(i) >0 :
+            factor = 1
+            score = 0
+        else:
+            factor = log(pk_time_average/pk_time[i]+10, 10)
+        final = score * factor
+        buf1 = [pk_player[i], str(pk_time[i]/TotalTime*100), pk_time[i], '=rank(c' + str(i+2) + ', c2:c80,1)',
+                factor, score, '=rank(f' + str(i+2) + ', f2:f80)', final, '=rank(h' + str(i+2) + ', h2:h80)']
+        if illegal_player.count(i) > 0:
+            Remark = Remark + 'Illegal Move '
+        elif slow_player.count(i) > 0:
+            Remark = Remark + 'Slow Player '
+        elif error_player.count(i) > 0:
+            Remark = Remark + 'Error: ' + str(error_message[error_player.index(i)])
+        buf1.append(Remark)
+        buf1.append(import_time[i])
+        ws.append(buf1)
+
+    # the distribution of the time of a move of every player, overall and
+    # by phase, and the players ranked by their slowest move
+    ws = wb.create_sheet('Latency')
+    header = ['Student', 'Moves', 'p50', 'p90', 'p99', 'Max']
+    for phase in game_phases:
+        header.extend([phase + ' ' + column for column in header[1:6]])
+    ws.append(header)
+    slowest = []
+    for i in range(len(pk_function)):
+        overall = latency_stats([t for phase in game_phases for t in latency[i][phase]])
+        row = [pk_player[i]] + overall
+        for phase in game_phases:
+            row.extend(latency_stats(latency[i][phase]))
+        ws.append(row)
+        if overall[0] > 0:
+            slowest.append((overall[4], overall[3], i))
+    slowest.sort(reverse=True)
+    warn = play_warn*TimeLimit
+    ws = wb.create_sheet('Slow Moves')
+    ws.append(['Rank', 'Student', 'Max', 'Margin', 'p99', 'Moves over %.2f s' % warn, 'Remark'])
+    for rank, (longest, p99, i) in enumerate(slowest):
+        over = sum(1 for phase in game_phases for t in latency[i][phase] if t >= warn)
+        Remark = ' '
+        if slow_player.count(i) > 0:
+            Remark = 'Slow Player'
+        elif over > 0:
+            Remark = 'Close to the time limit'
+            log_print(pk_player[i], 'is close to the time limit: slowest move %.3f s,' % longest,
+                      over, 'moves over %.2f s' % warn)
+        ws.append([rank+1, pk_player[i], longest, TimeLimit-longest, p99, over, Remark])
+    log_print('the time of the moves is in the sheets Latency and Slow Moves, '
+              'with the known games written to the journal or the results cache with their times')
+
+    # the ratings with their 95% confidence intervals, from the best
+    if play_rating:
+        ws = wb.create_sheet('Rating')
+        ws.append(['Rank', 'Student', 'Rating', 'Low', 'High', 'Games', 'Remark'])
+        disqualified = illegal_player + slow_player + error_player
+        for rank, i in enumerate(ratings.Ranking([i for i in range(len(pk_player))
+                                                  if i not in disqualified])):
+            low, high = ratings.Interval(i)
+            ws.append([rank+1, pk_player[i], ratings.Rating[i], low, high, ratings.Played(i), ' '])
+            log_print(rank+1, pk_player[i], 'rating %.0f (%.0f to %.0f),' % (ratings.Rating[i], low, high),
+                      ratings.Played(i), 'games')
+        for i in disqualified:
+            ws.append([None, pk_player[i], None, None, None, ratings.Played(i), 'Disqualified'])
+    save_workbook(wb, "time.xlsx")
+
+    if play_profile is not None:
+        profile_file.close()
+        log_print(f"statistics of every move saved in {play_profile}")
+    if play_archive is not None:
+        archive.Close()
+
+    # the tournament is complete, the next run starts from scratch
+    journal.close()
+    os.remove(play_journal)
+    cache.close()
+
+    # 关闭日志文件
+    log_print(f"日志文件已保存为: {log_filename}")
+    log_file.close()
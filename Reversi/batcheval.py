@@ -0,0 +1,90 @@
+# Module for Python course project V3.0 2025
+# This module evaluates many boards at once with NumPy
+# The boards are held in an (N, 8, 8) int8 array, cell (x,y) of board n
+# being Boards[n, x-1, y-1] with the values Black, White and Empty
+
+from Reversi import *
+import numpy as np
+
+# the positional weight of every cell
+PositionWeights = np.array([[100, -20, 10,  5,  5, 10, -20, 100],
+                            [-20, -50, -2, -2, -2, -2, -50, -20],
+                            [ 10,  -2, -1, -1, -1, -1,  -2,  10],
+                            [  5,  -2, -1, -1, -1, -1,  -2,   5],
+                            [  5,  -2, -1, -1, -1, -1,  -2,   5],
+                            [ 10,  -2, -1, -1, -1, -1,  -2,  10],
+                            [-20, -50, -2, -2, -2, -2, -50, -20],
+                            [100, -20, 10,  5,  5, 10, -20, 100]], dtype=np.int32)
+
+# the names of the columns of BatchFeatures
+FeatureNames = ['Position', 'OwnDiscs', 'OppDiscs', 'OwnFrontier',
+                'OppFrontier', 'OwnCorners', 'OppCorners']
+
+# the default coefficients of the features for BatchEvaluate
+FeatureWeights = np.array([1, 0, 0, -5, 5, 50, -50], dtype=np.int32)
+
+# to convert boards to an array
+def BoardsToArray(Boards):
+    '''To convert a list of 10 X 10 boards (as BoardInit) to an (N, 8, 8)
+    int8 array'''
+    return np.array([[Board[x][1:9] for x in range(1, 9)] for Board in Boards],
+                    dtype=np.int8).reshape(-1, 8, 8)
+
+# to get the boards after every possible move
+def ChildBoards(Player, Board):
+    '''To get (Moves, Children): the possible moves of the Player on the
+    Board and the (N, 8, 8) array of the boards after each of them'''
+    Moves = []
+    Children = []
+    for ((x, y), Count, Flips) in MoveFlips(Player, Board):
+        Child = BoardCopy(Board)
+        Child[x][y] = Player
+        for (xf, yf) in Flips:
+            Child[xf][yf] = Player
+        Moves.append((x, y))
+        Children.append(Child)
+    return Moves, BoardsToArray(Children)
+
+# the positional weight sums
+def WeightSums(Boards, Player, Weights=PositionWeights):
+    '''To get the sum of the Weights of the Player's cells minus those of
+    the opponent's cells, for every board'''
+    return np.einsum('nxy,xy->n', Boards.astype(np.int32)*Player, Weights)
+
+# the number of pieces
+def DiscCounts(Boards, Player):
+    '''To get (Own, Opp): the pieces of the Player and of the opponent on
+    every board'''
+    return (Boards == Player).sum(axis=(1, 2)), (Boards == -Player).sum(axis=(1, 2))
+
+# the number of frontier pieces
+def FrontierCounts(Boards, Player):
+    '''To get (Own, Opp): the pieces of the Player and of the opponent
+    next to an empty cell on every board'''
+    Empties = np.zeros((len(Boards), 10, 10), dtype=bool)
+    Empties[:, 1:9, 1:9] = Boards == Empty
+    NextToEmpty = np.zeros((len(Boards), 8, 8), dtype=bool)
+    for (dx, dy) in NeighbourPosition:
+        NextToEmpty |= Empties[:, 1+dx:9+dx, 1+dy:9+dy]
+    return ((Boards == Player) & NextToEmpty).sum(axis=(1, 2)), \
+           ((Boards == -Player) & NextToEmpty).sum(axis=(1, 2))
+
+# the number of corners
+def CornerCounts(Boards, Player):
+    '''To get (Own, Opp): the corners taken by the Player and by the
+    opponent on every board'''
+    Corners = Boards[:, [0, 0, 7, 7], [0, 7, 0, 7]]
+    return (Corners == Player).sum(axis=1), (Corners == -Player).sum(axis=1)
+
+# all the features of the boards
+def BatchFeatures(Boards, Player):
+    '''To get the (N, 7) array of the features of every board for the
+    Player, the columns being named in FeatureNames'''
+    return np.column_stack((WeightSums(Boards, Player),) + DiscCounts(Boards, Player) +
+                           FrontierCounts(Boards, Player) + CornerCounts(Boards, Player))
+
+# to evaluate the boards
+def BatchEvaluate(Boards, Player, Weights=FeatureWeights):
+    '''To get the value of every board for the Player: the features of
+    BatchFeatures weighted by Weights'''
+    return BatchFeatures(Boards, Player) @ Weights
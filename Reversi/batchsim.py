@@ -0,0 +1,131 @@
+# Module for Python course project V3.0 2025
+# This module plays many random games at once with NumPy
+# Every game is a lane of uint64 arrays holding the bitboards of Reversi
+# (bit (x-1)*8+(y-1) for cell (x,y)), the moves of all the lanes are
+# generated and played together. A lane passes when its player has no
+# possible move and stops when both players have none, as in PlayGame.
+#   python batchsim.py [games]
+
+from Reversi import *
+import numpy as np
+import sys
+import time
+
+# the shifts and masks of BitDirections as NumPy values
+BatchDirections = tuple((np.uint64(abs(Shift)), Shift > 0, np.uint64(Mask))
+                        for (Shift, Mask) in BitDirections)
+
+# the square recorded for a pass, and after the end of the game
+BatchPass = -1
+BatchEnd = -2
+
+# the masks of the bit count
+BatchM1 = np.uint64(0x5555555555555555)
+BatchM2 = np.uint64(0x3333333333333333)
+BatchM4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+BatchH01 = np.uint64(0x0101010101010101)
+
+# the number of bits of all the lanes
+def BatchCount(Bits):
+    '''To count the bits of every lane, adding them in parallel'''
+    Bits = Bits-((Bits >> np.uint64(1)) & BatchM1)
+    Bits = (Bits & BatchM2)+((Bits >> np.uint64(2)) & BatchM2)
+    Bits = (Bits+(Bits >> np.uint64(4))) & BatchM4
+    return ((Bits*BatchH01) >> np.uint64(56)).astype(np.int64)
+
+# to shift the bitboards of all the lanes in a direction
+def BatchShift(Bits, Shift, Left, Mask):
+    if Left:
+        return (Bits << Shift) & Mask
+    return (Bits >> Shift) & Mask
+
+# the possible moves of all the lanes
+def BatchMoves(Own, Opp):
+    '''To get the bit sets of the possible moves of the players owning Own
+    against Opp, for every lane, as BitMoves'''
+    Empties = ~(Own | Opp)
+    Moves = np.zeros_like(Own)
+    for (Shift, Left, Mask) in BatchDirections:
+        Line = Opp & Mask
+        Flip = BatchShift(Own, Shift, Left, Mask) & Line
+        for k in range(5):
+            Flip |= BatchShift(Flip, Shift, Left, Mask) & Line
+        Moves |= BatchShift(Flip, Shift, Left, Mask) & Empties
+    return Moves
+
+# the pieces flipped by a move in all the lanes
+def BatchFlips(Own, Opp, Move):
+    '''To get the bit sets of the opponent pieces flipped when the players
+    owning Own place a piece on the bit set Move (one bit, or none for a
+    lane without move), for every lane, as BitFlips'''
+    Flips = np.zeros_like(Own)
+    for (Shift, Left, Mask) in BatchDirections:
+        Line = BatchShift(Move, Shift, Left, Mask) & Opp
+        for k in range(5):
+            Line |= BatchShift(Line, Shift, Left, Mask) & Opp
+        Closed = (BatchShift(Line, Shift, Left, Mask) & Own) != 0
+        Flips |= np.where(Closed, Line, np.uint64(0))
+    return Flips
+
+# to pick a random move in every lane
+def BatchPick(Moves, Generator):
+    '''To get the bit of a move chosen at random among the Moves of every
+    lane, as player1 does, 0 for a lane without move: the lowest bit left
+    after clearing a random number of the lowest bits'''
+    Pick = (Generator.random(len(Moves))*BatchCount(Moves)).astype(np.int64)
+    for k in range(Pick.max(initial=0)):
+        Moves = np.where(Pick > k, Moves & (Moves-np.uint64(1)), Moves)
+    return Moves & (~Moves+np.uint64(1))
+
+# to play random games
+def SimulateGames(Count, Seed=None, Record=False):
+    '''To play Count games of random moves from BoardInit(), White first.
+    The return value is (Results, Squares): the result of every game as
+    given by PlayGame (Black pieces minus White pieces) and, with
+    Record=True, the (Count, plies) int8 array of the bit of every move,
+    BatchPass for a pass and BatchEnd after the end of the game (None
+    without Record)'''
+    Generator = np.random.default_rng(Seed)
+    (WhiteBits, BlackBits) = BitBoardInit(White)
+    Own = np.full(Count, WhiteBits, dtype=np.uint64)
+    Opp = np.full(Count, BlackBits, dtype=np.uint64)
+    Colour = np.full(Count, White, dtype=np.int8)
+    Passed = np.zeros(Count, dtype=bool)
+    Playing = np.ones(Count, dtype=bool)
+    Squares = []
+    while Playing.any():
+        Moves = BatchMoves(Own, Opp)
+        Moves[~Playing] = 0
+        Pass = Playing & (Moves == 0)
+        Playing &= ~(Pass & Passed)
+        Passed = Pass
+        Move = BatchPick(Moves, Generator)
+        Flips = BatchFlips(Own, Opp, Move)
+        if Record:
+            Square = np.log2(np.maximum(Move, np.uint64(1)).astype(np.float64)).astype(np.int8)
+            Squares.append(np.where(Moves != 0, Square, np.where(Playing, BatchPass, BatchEnd)).astype(np.int8))
+        (Own, Opp) = (np.where(Playing, Opp & ~Flips, Own), np.where(Playing, Own | Flips | Move, Opp))
+        Colour = np.where(Playing, -Colour, Colour)
+    # Own belongs to the player who would move next
+    Results = (BatchCount(Own)-BatchCount(Opp))*Colour
+    if Record:
+        return Results, np.array(Squares, dtype=np.int8).T
+    return Results, None
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        Count = int(sys.argv[1])
+    else:
+        Count = 10000
+    StartTime = time.perf_counter()
+    (Results, Squares) = SimulateGames(Count)
+    Used = time.perf_counter()-StartTime
+    print('%d games in %.2f s, %.0f games/s' % (Count, Used, Count/Used))
+    print('Black wins %.3f, draws %.3f, White wins %.3f' % ((Results > 0).mean(), (Results == 0).mean(),
+                                                           (Results < 0).mean()))
+    Games = max(1, Count // 100)
+    StartTime = time.perf_counter()
+    for Game in range(Games):
+        PlayGame(player1, player1)
+    Used = time.perf_counter()-StartTime
+    print('PlayGame(player1, player1): %.0f games/s' % (Games/Used))
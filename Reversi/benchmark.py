@@ -0,0 +1,179 @@
+# Module for Python course project V3.0 2025
+# This module measures the speed of the functions of Reversi
+#   python benchmark.py [--json FILE] [--compare OLD.json] [--copy]
+# runs every primitive on a fixed corpus of positions, from the opening to
+# the endgame, prints ops/sec and percentiles of the time of one call and
+# writes the results as JSON to be compared with those of another commit
+
+from Reversi import *
+import argparse
+import copy
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+
+# to time a function
+def TimeIt(Function, Number):
+    '''To call Function() Number times and return the average time used
+    in seconds'''
+    StartTime = time.perf_counter()
+    for i in range(Number):
+        Function()
+    return (time.perf_counter()-StartTime)/Number
+
+# to get a board of the middle game
+def MiddleBoard():
+    '''To get a board after 30 moves of the demo player'''
+    random.seed(2025)
+    Board = BoardInit()
+    Colour = White
+    for i in range(30):
+        a = PossibleMove(Colour, Board)
+        if len(a) != 0:
+            (x, y) = a[random.randrange(0, len(a))]
+            PlaceMove(Colour, Board, x, y)
+        Colour = -1*Colour
+    return Board
+
+# to count the board snapshots taken in a game
+def SnapshotCount(Number):
+    '''To get the average number of board snapshots PlayGame takes in one
+    game: one for every call of a player and one for the returned board'''
+    Count = [0]
+    def player(Colour, Board):
+        Count[0] = Count[0]+1
+        return player1(Colour, Board)
+    for i in range(Number):
+        PlayGame(player, player)
+    return Count[0]/Number+1
+
+# the copy overhead benchmark
+def CopyBenchmark(Number=20000, Games=50):
+    '''To print the cost of one board snapshot and of all the snapshots of
+    one game, with copy.deepcopy (before) and BoardCopy, followed by the
+    time of a whole game of player1'''
+    Board = MiddleBoard()
+    Snapshots = SnapshotCount(Games)
+    print('snapshots per game: %.1f' % Snapshots)
+    for (Name, Function) in [('copy.deepcopy', copy.deepcopy),
+                             ('BoardCopy', BoardCopy)]:
+        Used = TimeIt(lambda: Function(Board), Number)
+        print('%-14s %8.2f us per copy %8.3f ms per game'
+              % (Name, Used*1e6, Used*Snapshots*1e3))
+    Used = TimeIt(lambda: PlayGame(player1, player1), Games)
+    print('PlayGame(player1, player1) %8.3f ms per game' % (Used*1e3))
+
+# the corpus of positions
+def Corpus(Games=8, Seed=2025):
+    '''To get the fixed list of (Colour, Board) of every position, with a
+    possible move, of Games games of random moves from the Seed'''
+    Generator = random.Random(Seed)
+    Positions = []
+    for Game in range(Games):
+        Board = BoardInit()
+        Colour = White
+        Passed = False
+        while True:
+            a = ListPossibleMove(Colour, Board)
+            if len(a) != 0:
+                Positions.append((Colour, BoardCopy(Board)))
+                (x, y) = a[Generator.randrange(0, len(a))]
+                ListPlaceMove(Colour, Board, x, y)
+                Passed = False
+            elif Passed:
+                break
+            else:
+                Passed = True
+            Colour = -1*Colour
+    return Positions
+
+# to get a percentile of sorted values
+def Percentile(Values, p):
+    return Values[min(len(Values)-1, int(len(Values)*p/100))]
+
+# to time every call of a function
+def TimeCalls(Calls, Repeat):
+    '''To call every function of the list Calls Repeat times and get the
+    statistics of the time of one call: ops/sec, mean and percentiles in
+    microseconds'''
+    Times = []
+    Clock = time.perf_counter
+    for r in range(Repeat):
+        for Call in Calls:
+            StartTime = Clock()
+            Call()
+            Times.append(Clock()-StartTime)
+    Times.sort()
+    Total = sum(Times)
+    return {'calls': len(Times), 'ops_per_sec': len(Times)/Total,
+            'mean_us': Total/len(Times)*1e6,
+            'p50_us': Percentile(Times, 50)*1e6, 'p90_us': Percentile(Times, 90)*1e6,
+            'p99_us': Percentile(Times, 99)*1e6, 'max_us': Times[-1]*1e6}
+
+# the benchmark of the primitives
+def PrimitiveBenchmark(Repeat=20, Games=100):
+    '''To get {name: statistics} for BoardInit, BoardCopy, PossibleMove,
+    PlaceMove on the corpus, and for whole games of player1 against itself'''
+    Positions = Corpus()
+    Results = {}
+    Results['BoardInit'] = TimeCalls([BoardInit]*len(Positions), Repeat)
+    Results['BoardCopy'] = TimeCalls([lambda Board=Board: BoardCopy(Board)
+                                      for (Colour, Board) in Positions], Repeat)
+    Results['PossibleMove'] = TimeCalls([lambda Colour=Colour, Board=Board: PossibleMove(Colour, Board)
+                                         for (Colour, Board) in Positions], Repeat)
+    # PlaceMove changes the board, every call gets a copy made beforehand
+    Moves = [(Colour, Board, ListPossibleMove(Colour, Board)[0]) for (Colour, Board) in Positions]
+    Calls = []
+    for r in range(Repeat):
+        for (Colour, Board, (x, y)) in Moves:
+            Copy = BoardCopy(Board)
+            Calls.append(lambda Colour=Colour, Copy=Copy, x=x, y=y: PlaceMove(Colour, Copy, x, y))
+    Results['PlaceMove'] = TimeCalls(Calls, 1)
+    random.seed(2025)
+    Results['PlayGame'] = TimeCalls([lambda: PlayGame(player1, player1)], Games)
+    Results['PlayGame']['games_per_sec'] = Results['PlayGame']['ops_per_sec']
+    return Results
+
+# the commit of the working tree, if any
+def GitCommit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return ''
+
+# to print the results, compared to older ones
+def PrintResults(Results, Old=None):
+    print('%-13s %12s %10s %10s %10s %10s' % ('primitive', 'ops/sec', 'p50 us', 'p90 us', 'p99 us', 'change'))
+    for (Name, Stats) in Results.items():
+        Change = ''
+        if Old is not None and Name in Old:
+            Change = '%+.1f%%' % ((Stats['ops_per_sec']/Old[Name]['ops_per_sec']-1)*100)
+        print('%-13s %12.1f %10.2f %10.2f %10.2f %10s' % (Name, Stats['ops_per_sec'], Stats['p50_us'],
+                                                           Stats['p90_us'], Stats['p99_us'], Change))
+
+if __name__ == '__main__':
+    Parser = argparse.ArgumentParser(description='benchmark of the Reversi primitives')
+    Parser.add_argument('--json', help='file to write the results to')
+    Parser.add_argument('--compare', help='results of an earlier run to compare with')
+    Parser.add_argument('--backend', default=Backend, choices=sorted(Backends))
+    Parser.add_argument('--copy', action='store_true', help='run the board copy benchmark')
+    Args = Parser.parse_args()
+    if Args.copy:
+        CopyBenchmark()
+        sys.exit()
+    SetBackend(Args.backend)
+    Results = PrimitiveBenchmark()
+    Old = None
+    if Args.compare:
+        with open(Args.compare) as f:
+            Old = json.load(f)['results']
+    PrintResults(Results, Old)
+    if Args.json:
+        with open(Args.json, 'w') as f:
+            json.dump({'commit': GitCommit(), 'backend': Args.backend,
+                       'python': platform.python_version(), 'platform': platform.platform(),
+                       'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'results': Results}, f, indent=1)
@@ -0,0 +1,169 @@
+# Module for Python course project V3.0 2025
+# This module provide an exact endgame solver for the last empty cells
+# It finds the best move and the final difference of pieces with perfect
+# play of both sides, searching on the bitboards of Reversi
+
+from Reversi import *
+import time
+
+# the solver is used by search.py from this number of empty cells
+EndgameEmpties = 12
+
+# from this number of empty cells the moves are ordered fastest-first,
+# below it only by the parity of the regions
+FastestFirstEmpties = 7
+
+# positions with at least this number of empty cells are kept in the cache
+CacheEmpties = 6
+
+# the cache is cleared when it holds more positions
+CacheSize = 1 << 20
+
+# the bits of the four quadrants of the board, the regions for the parity
+Quadrants = []
+for (xs, ys) in [(0, 0), (0, 4), (4, 0), (4, 4)]:
+    Quadrants.append(sum(1 << ((xs+x)*8+ys+y) for x in range(4) for y in range(4)))
+Quadrants = tuple(Quadrants)
+
+# the quadrant of every bit
+QuadrantOf = tuple(((Square >> 3) >= 4)*2+((Square & 7) >= 4) for Square in range(64))
+
+# the exception to stop solving at the deadline
+class EndgameTimeout(Exception):
+    pass
+
+# an exact solver with its cache of solved positions
+class Solver:
+    '''An exact alpha-beta solver of the endgame. The value of a position
+    is the pieces of the player to move minus those of the opponent at the
+    end of the game (as the result of PlayGame, empty cells are not
+    counted). The cache keeps the bounds found for the positions, so keep
+    one Solver for a whole game.'''
+
+    def __init__(self):
+        self.Cache = {}
+        self.Nodes = 0
+        self.Deadline = float('inf')
+
+    # to put the moves in the order to search them
+    def Order(self, Own, Opp, Moves, Empties):
+        '''To list the squares of Moves: those in a quadrant with an odd
+        number of empty cells first and, with many empty cells, those
+        leaving the opponent the fewest moves first'''
+        Odd = 0
+        for Quadrant in Quadrants:
+            if BitCount(Empties & Quadrant) & 1:
+                Odd |= Quadrant
+        Squares = []
+        while Moves:
+            Low = Moves & -Moves
+            Squares.append(Low.bit_length()-1)
+            Moves ^= Low
+        if BitCount(Empties) >= FastestFirstEmpties:
+            Keys = {}
+            for Square in Squares:
+                Flips = BitFlips(Own, Opp, Square)
+                Mobility = BitCount(BitMoves(Opp ^ Flips, Own | Flips | (1 << Square)))
+                Keys[Square] = Mobility*2+(not (Odd >> Square & 1))
+            Squares.sort(key=Keys.get)
+        else:
+            Squares.sort(key=lambda Square: not (Odd >> Square & 1))
+        return Squares
+
+    # the alpha-beta search to the end of the game
+    def Solve(self, Own, Opp, Alpha=-64, Beta=64):
+        '''To get the exact value of the position for the player owning
+        Own, to move, if it is within the window (Alpha, Beta), otherwise a
+        bound of it'''
+        self.Nodes += 1
+        if self.Nodes & 1023 == 0 and time.perf_counter() > self.Deadline:
+            raise EndgameTimeout()
+        Moves = BitMoves(Own, Opp)
+        if not Moves:
+            if not BitMoves(Opp, Own):
+                return BitCount(Own)-BitCount(Opp)
+            return -self.Solve(Opp, Own, -Beta, -Alpha)
+        Empties = ~(Own | Opp) & BitFull
+        if Moves & (Moves-1) == 0:
+            # only one move, nothing to order or to keep
+            Square = Moves.bit_length()-1
+            Flips = BitFlips(Own, Opp, Square)
+            return -self.Solve(Opp ^ Flips, Own | Flips | Moves, -Beta, -Alpha)
+        Key = None
+        if BitCount(Empties) >= CacheEmpties:
+            Key = (Own, Opp)
+            if Key in self.Cache:
+                (Low, High) = self.Cache[Key]
+                if Low >= Beta or Low == High:
+                    return Low
+                if High <= Alpha:
+                    return High
+                Alpha = max(Alpha, Low)
+                Beta = min(Beta, High)
+        AlphaStart = Alpha
+        Best = -65
+        for Square in self.Order(Own, Opp, Moves, Empties):
+            Flips = BitFlips(Own, Opp, Square)
+            Value = -self.Solve(Opp ^ Flips, Own | Flips | (1 << Square), -Beta, -Alpha)
+            if Value > Best:
+                Best = Value
+                if Value > Alpha:
+                    Alpha = Value
+                    if Alpha >= Beta:
+                        break
+        if Key is not None:
+            if len(self.Cache) >= CacheSize:
+                self.Cache.clear()
+            (Low, High) = self.Cache.get(Key, (-64, 64))
+            if Best <= AlphaStart:
+                High = min(High, Best)
+            elif Best >= Beta:
+                Low = max(Low, Best)
+            else:
+                Low = High = Best
+            self.Cache[Key] = (Low, High)
+        return Best
+
+    # to solve the best move of a position
+    def BestMove(self, Own, Opp, Budget=None):
+        '''To get (Square, Value) of the best move for the player owning Own
+        and the exact value of the position. Square is -1 when there is no
+        possible move. EndgameTimeout is raised when Budget seconds (no
+        limit for None) are used before the end.'''
+        if Budget is None:
+            self.Deadline = float('inf')
+        else:
+            self.Deadline = time.perf_counter()+Budget
+        self.Nodes = 0
+        Moves = BitMoves(Own, Opp)
+        if not Moves:
+            return -1, self.Solve(Own, Opp)
+        Empties = ~(Own | Opp) & BitFull
+        Alpha = -65
+        BestSquare = -1
+        for Square in self.Order(Own, Opp, Moves, Empties):
+            Flips = BitFlips(Own, Opp, Square)
+            Value = -self.Solve(Opp ^ Flips, Own | Flips | (1 << Square), -64, -Alpha)
+            if Value > Alpha:
+                Alpha = Value
+                BestSquare = Square
+        return BestSquare, Alpha
+
+# the solver used by EndgameMove
+DefaultSolver = Solver()
+
+# to solve the best move for a player function
+def EndgameMove(Colour, Board, Budget=TimeLimit*2/3, Solver=None):
+    '''To get the best move (x,y) of the Colour on the Board with perfect
+    play to the end of the game, (0,0) when there is no possible move, or
+    None when it is not solved within Budget seconds'''
+    if Solver is None:
+        Solver = DefaultSolver
+    Own, Opp = BoardToBits(Colour, Board)
+    try:
+        (Square, Value) = Solver.BestMove(Own, Opp, Budget)
+    except EndgameTimeout:
+        return None
+    if Square < 0:
+        return (0, 0)
+    return BitCell[Square]
@@ -0,0 +1,212 @@
+# Module for Python course project V3.0 2025
+# This module records the moves of games and replays them
+# A game is recorded as one byte per turn, White first: the bit
+# (x-1)*8+(y-1) of the cell (x,y) played, plus RecordLate when the move
+# came after the time limit, RecordPass for a pass, RecordInvalid for a
+# move out of the board, RecordError for a player raising an exception or
+# RecordTimeout for a player cut off at the time limit. The games are
+# appended to an archive file, and an index file gives the players, the
+# round, the result and the place of every game.
+#   python gamerecord.py ARCHIVE [GAME [TURN]]
+# lists the games of the archive, or replays a game up to a turn.
+
+from Reversi import *
+import os
+import struct
+import sys
+
+# the bytes of a turn without a move on the board
+RecordPass = 64
+RecordInvalid = 65
+RecordError = 66
+RecordTimeout = 67
+
+# added to the byte of a move returned after the time limit
+RecordLate = 128
+
+# the first bytes of an archive and of its index
+ArchiveHeader = b'REVGAME1'
+IndexHeader = b'REVINDX1'
+
+# an index entry: offset and length of the moves, result, round and the
+# names (utf-8, at most 16 bytes) of PlayerWhite and PlayerBlack
+IndexFormat = '<QHhH16s16s'
+IndexSize = struct.calcsize(IndexFormat)
+
+# the byte of a turn
+def EncodeMove(Move, ErrCode=0):
+    '''To get the byte of the Move (x,y) returned by a player, ErrCode
+    being that of the turn as given to the hook of PlayGame'''
+    if ErrCode == NoMove:
+        return RecordPass
+    if ErrCode == PlayerError:
+        return RecordError
+    Byte = RecordInvalid
+    try:
+        (x, y) = Move
+        if ValidCell(x, y) and x == int(x) and y == int(y):
+            Byte = (int(x)-1)*8+int(y)-1
+    except (TypeError, ValueError):
+        pass
+    if ErrCode == PlayerSlow:
+        # a slow move is placed by PlayGame, a cut off player has none
+        if Byte == RecordInvalid:
+            return RecordTimeout
+        return Byte+RecordLate
+    return Byte
+
+# the bytes of a game
+def EncodeGame(Turns):
+    '''To get the moves of a game from the dicts given to the hook of
+    PlayGame for each of its turns'''
+    return bytes(EncodeMove(Turn['Move'], Turn['ErrCode']) for Turn in Turns)
+
+# a hook of PlayGame recording the moves
+class MoveRecorder:
+    '''A hook for PlayGame keeping the byte of every turn in Moves'''
+
+    def __init__(self):
+        self.Moves = bytearray()
+
+    def __call__(self, Turn):
+        self.Moves.append(EncodeMove(Turn['Move'], Turn['ErrCode']))
+
+# to play a game and record it
+def RecordGame(PlayerWhite, PlayerBlack):
+    '''Board, Result, TimeUsed, ErrorMessage, Moves = RecordGame(PlayerWhite, PlayerBlack)
+
+    To play a game with PlayGame and get its moves as well'''
+    Recorder = MoveRecorder()
+    (Board, Result, PlayTime, Error) = PlayGame(PlayerWhite, PlayerBlack, Hook=Recorder)
+    return Board, Result, PlayTime, Error, bytes(Recorder.Moves)
+
+# an archive of recorded games
+class GameArchive:
+    '''The archive FileName and its index FileName.idx. With Append=True
+    the games are added at the end of the files, which are created if
+    needed. Count is the number of games in the index.'''
+
+    def __init__(self, FileName, Append=False):
+        self.FileName = FileName
+        self.IndexName = FileName + '.idx'
+        Mode = 'a+b' if Append else 'rb'
+        self.File = open(FileName, Mode)
+        self.Index = open(self.IndexName, Mode)
+        for (f, Header) in [(self.File, ArchiveHeader), (self.Index, IndexHeader)]:
+            f.seek(0)
+            Start = f.read(len(Header))
+            if Append and len(Start) == 0:
+                f.write(Header)
+            elif Start != Header:
+                self.Close()
+                raise ValueError('%s is not a game archive' % FileName)
+        self.Index.seek(0, os.SEEK_END)
+        # an entry cut by an interruption is not counted
+        self.Count = (self.Index.tell()-len(IndexHeader)) // IndexSize
+
+    # to close the files
+    def Close(self):
+        self.File.close()
+        self.Index.close()
+
+    # to add a game
+    def Append(self, WhiteName, BlackName, Round, Result, Moves):
+        '''To add the game of the players named WhiteName and BlackName with
+        its Result (as given by PlayGame) and its Moves'''
+        self.File.seek(0, os.SEEK_END)
+        Offset = self.File.tell()
+        self.File.write(Moves)
+        self.File.flush()
+        self.Index.seek(len(IndexHeader)+self.Count*IndexSize)
+        self.Index.truncate()
+        self.Index.write(struct.pack(IndexFormat, Offset, len(Moves), Result, Round,
+                                     WhiteName.encode('utf-8')[:16], BlackName.encode('utf-8')[:16]))
+        self.Index.flush()
+        self.Count = self.Count+1
+
+    # to get a game
+    def Game(self, Number):
+        '''To get (WhiteName, BlackName, Round, Result, Moves) of the game
+        Number, counted from 0'''
+        if not 0 <= Number < self.Count:
+            raise IndexError('no game %d in %s' % (Number, self.FileName))
+        self.Index.seek(len(IndexHeader)+Number*IndexSize)
+        (Offset, Length, Result, Round, WhiteName, BlackName) = struct.unpack(IndexFormat, self.Index.read(IndexSize))
+        self.File.seek(Offset)
+        Moves = self.File.read(Length)
+        return (WhiteName.rstrip(b'\0').decode('utf-8'), BlackName.rstrip(b'\0').decode('utf-8'),
+                Round, Result, Moves)
+
+# to replay a game
+def ReplayGame(Moves, Turns=None):
+    '''Board, Colour, Error = ReplayGame(Moves, Turns)
+
+    To rebuild the board after the first Turns turns of the recorded Moves
+    (all of them for None) with PlaceMove, White first. Colour is the
+    player of the next turn. Error is '' or tells the turn which cannot be
+    replayed: a move which is not possible, a pass with a possible move,
+    a move out of the board, a player error or time out, or a move after
+    the time limit, which is placed before stopping.'''
+    Board = BoardInit()
+    Colour = White
+    if Turns is None:
+        Turns = len(Moves)
+    for Turn in range(min(Turns, len(Moves))):
+        a = PossibleMove(Colour, Board)
+        if Moves[Turn] == RecordPass:
+            if len(a) != 0:
+                return Board, Colour, 'turn %d: a pass with possible moves' % (Turn+1)
+        elif Moves[Turn] == RecordInvalid:
+            return Board, Colour, 'turn %d: a move out of the board' % (Turn+1)
+        elif Moves[Turn] == RecordError:
+            return Board, Colour, 'turn %d: the player raised an exception' % (Turn+1)
+        elif Moves[Turn] == RecordTimeout:
+            return Board, Colour, 'turn %d: no move within the time limit' % (Turn+1)
+        else:
+            (x, y) = BitCell[Moves[Turn] % RecordLate]
+            if (x, y) not in a:
+                return Board, Colour, 'turn %d: (%d,%d) is not a possible move' % (Turn+1, x, y)
+            Board = PlaceMove(Colour, Board, x, y)
+            if Moves[Turn] >= RecordLate:
+                return Board, -1*Colour, 'turn %d: (%d,%d) played after the time limit' % (Turn+1, x, y)
+        Colour = -1*Colour
+    return Board, Colour, ''
+
+# to show the moves of a game
+def MoveText(Moves):
+    '''To get the moves as text: (x,y), late(x,y), pass, invalid, error or
+    timeout for every turn'''
+    Text = []
+    for Move in Moves:
+        if Move == RecordPass:
+            Text.append('pass')
+        elif Move == RecordInvalid:
+            Text.append('invalid')
+        elif Move == RecordError:
+            Text.append('error')
+        elif Move == RecordTimeout:
+            Text.append('timeout')
+        elif Move >= RecordLate:
+            Text.append('late(%d,%d)' % BitCell[Move % RecordLate])
+        else:
+            Text.append('(%d,%d)' % BitCell[Move])
+    return ' '.join(Text)
+
+if __name__ == '__main__':
+    Archive = GameArchive(sys.argv[1])
+    if len(sys.argv) < 3:
+        for Number in range(Archive.Count):
+            (WhiteName, BlackName, Round, Result, Moves) = Archive.Game(Number)
+            print('%5d %-16s %-16s round %d result %d, %d turns' % (Number, WhiteName, BlackName, Round,
+                                                                      Result, len(Moves)))
+    else:
+        (WhiteName, BlackName, Round, Result, Moves) = Archive.Game(int(sys.argv[2]))
+        Turns = int(sys.argv[3]) if len(sys.argv) > 3 else None
+        (Board, Colour, Error) = ReplayGame(Moves, Turns)
+        print('White', WhiteName, 'Black', BlackName, 'round', Round, 'result', Result)
+        print(MoveText(Moves[:Turns]))
+        drawBoard(Board)
+        print('next turn:', 'White' if Colour == White else 'Black')
+        if Error:
+            print(Error)
+    Archive.Close()
@@ -0,0 +1,181 @@
+# Module for Python course project V3.0 2025
+# This module provide a Monte Carlo tree search (UCT) for player functions
+# The tree and the random playouts use the bitboards of Reversi. The tree
+# is kept between the moves of a game and the search stops at a wall-clock
+# budget below the TimeLimit of PlayGame.
+
+from Reversi import *
+import math
+import random
+import time
+
+# time used for one move by default, to stay clear of TimeLimit
+TimeBudget = TimeLimit*2/3
+
+# the exploration constant of UCT
+Exploration = 1.4
+
+# a node of the search tree
+class Node:
+    '''The position of the player owning Own, to move. Wins counts the
+    playouts won by the player who moved to this position (a draw is half
+    a win) out of Visits. The square -1 is a pass.'''
+    __slots__ = ('Own', 'Opp', 'Untried', 'Children', 'Visits', 'Wins')
+
+    def __init__(self, Own, Opp):
+        self.Own = Own
+        self.Opp = Opp
+        Moves = BitMoves(Own, Opp)
+        if Moves:
+            self.Untried = [Square for Square in range(64) if Moves >> Square & 1]
+        elif BitMoves(Opp, Own):
+            self.Untried = [-1]
+        else:
+            self.Untried = []
+        self.Children = {}
+        self.Visits = 0
+        self.Wins = 0.0
+
+    # to create the child after a move
+    def Expand(self, Square):
+        if Square < 0:
+            Child = Node(self.Opp, self.Own)
+        else:
+            Flips = BitFlips(self.Own, self.Opp, Square)
+            Child = Node(self.Opp ^ Flips, self.Own | Flips | (1 << Square))
+        self.Children[Square] = Child
+        return Child
+
+    # to choose the child to visit
+    def Select(self):
+        '''To get the child with the highest upper confidence bound'''
+        LogVisits = math.log(self.Visits)
+        Best = None
+        BestValue = -1.0
+        for Child in self.Children.values():
+            Value = Child.Wins/Child.Visits+Exploration*math.sqrt(LogVisits/Child.Visits)
+            if Value > BestValue:
+                Best = Child
+                BestValue = Value
+        return Best
+
+# a light playout
+def Playout(Own, Opp):
+    '''To play random moves from the position of the player owning Own, to
+    move, to the end of the game. The return value is 1 when this player
+    wins, 0.5 for a draw and 0 when he loses.'''
+    Sign = 1
+    Passed = False
+    while True:
+        Moves = BitMoves(Own, Opp)
+        if Moves:
+            Passed = False
+            Count = BitCount(Moves)
+            Pick = random.randrange(Count)
+            for i in range(Pick):
+                Moves &= Moves-1
+            Low = Moves & -Moves
+            Flips = BitFlips(Own, Opp, Low.bit_length()-1)
+            (Own, Opp) = (Opp ^ Flips, Own | Flips | Low)
+        elif Passed:
+            break
+        else:
+            Passed = True
+            (Own, Opp) = (Opp, Own)
+        Sign = -Sign
+    Difference = (BitCount(Own)-BitCount(Opp))*Sign
+    if Difference > 0:
+        return 1.0
+    elif Difference < 0:
+        return 0.0
+    return 0.5
+
+# a Monte Carlo tree search keeping its tree between the moves
+class MCTS:
+    '''A UCT search. Keep one MCTS for a whole game: the subtree of the new
+    position is used again when it was reached by the moves since the
+    last search. Playouts and Rate (playouts per second) report the last
+    search.'''
+
+    def __init__(self):
+        self.Root = None
+        self.Playouts = 0
+        self.Rate = 0.0
+
+    # to find the node of a position in the tree of the last search
+    def Reuse(self, Own, Opp):
+        '''To get the node of the position from the last root or from the
+        two moves below it, None when it is not in the tree'''
+        if self.Root is None:
+            return None
+        Nodes = [self.Root]
+        for Depth in range(3):
+            for Node in Nodes:
+                if Node.Own == Own and Node.Opp == Opp:
+                    return Node
+            Nodes = [Child for Node in Nodes for Child in Node.Children.values()]
+        return None
+
+    # one iteration: select, expand, playout and back up
+    def Iterate(self, Root):
+        Node = Root
+        Path = [Node]
+        while not Node.Untried and Node.Children:
+            Node = Node.Select()
+            Path.append(Node)
+        if Node.Untried:
+            Square = Node.Untried.pop(random.randrange(len(Node.Untried)))
+            Node = Node.Expand(Square)
+            Path.append(Node)
+        Value = Playout(Node.Own, Node.Opp)
+        for Node in reversed(Path):
+            Node.Visits += 1
+            Node.Wins += 1-Value
+            Value = 1-Value
+
+    # to search the best move of a position
+    def Search(self, Own, Opp, Budget=TimeBudget):
+        '''To search the position of the player owning Own until Budget
+        seconds are used. The return value is the square of the most
+        visited move, -1 when there is no possible move.'''
+        StartTime = time.perf_counter()
+        Deadline = StartTime+Budget
+        if not BitMoves(Own, Opp):
+            return -1
+        Root = self.Reuse(Own, Opp)
+        if Root is None:
+            Root = Node(Own, Opp)
+        self.Root = Root
+        self.Playouts = 0
+        while True:
+            self.Iterate(Root)
+            self.Playouts += 1
+            if time.perf_counter() > Deadline:
+                break
+        self.Rate = self.Playouts/(time.perf_counter()-StartTime)
+        return max(Root.Children, key=lambda Square: Root.Children[Square].Visits)
+
+# the search used by MCTSMove
+DefaultMCTS = MCTS()
+
+# to search the best move for a player function
+def MCTSMove(Colour, Board, Budget=TimeBudget, Search=None):
+    '''To get the best move (x,y) of the Colour on the Board found by the
+    Monte Carlo tree search within Budget seconds, (0,0) when there is no
+    possible move'''
+    if Search is None:
+        Search = DefaultMCTS
+    Own, Opp = BoardToBits(Colour, Board)
+    Square = Search.Search(Own, Opp, Budget)
+    if Square < 0:
+        return (0, 0)
+    return BitCell[Square]
+
+# a player function using the Monte Carlo tree search
+def player(Colour, Board):
+    '''A player function searching every move with MCTSMove'''
+    return MCTSMove(Colour, Board)
+
+if __name__ == '__main__':
+    Board, Result, PlayTime, Error = PlayGame(player, player1)
+    print('result', Result, 'time', PlayTime, 'playouts/s of the last move %.0f' % DefaultMCTS.Rate)
@@ -0,0 +1,147 @@
+# Module for Python course project V3.0 2025
+# This module provide an opening book shared by player functions
+# The book file is a header followed by records of a 16 bytes position key
+# and the 1 byte square of the book move, sorted by key. The file is
+# memory-mapped and searched by bisection, nothing is loaded at start.
+
+from Reversi import *
+import mmap
+import os
+
+# the first bytes of a book file
+BookHeader = b'REVBOOK1'
+
+# the size of a record: key and square
+RecordSize = 17
+
+# the book file used by BookMove
+BookFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening.book')
+
+# the key of a position
+def BookKey(Own, Opp):
+    '''To get (Key, t): the 128 bits key of the position of the player
+    owning Own, to move, the same for all the symmetric positions, and the
+    symmetry t moving the position to the one of the key'''
+    (Own, Opp, t) = CanonicalBits(Own, Opp)
+    return (Own << 64) | Opp, t
+
+# to write a book file
+def WriteBook(FileName, Entries):
+    '''To write the book file from Entries {Key: Square}, the squares being
+    those of the positions of the keys'''
+    with open(FileName, 'wb') as f:
+        f.write(BookHeader)
+        for Key in sorted(Entries):
+            f.write(Key.to_bytes(16, 'big') + bytes([Entries[Key]]))
+
+# an opening book file
+class OpeningBook:
+    '''The opening book of the file FileName, memory-mapped for lookups'''
+
+    def __init__(self, FileName=BookFile):
+        self.File = open(FileName, 'rb')
+        Size = os.path.getsize(FileName)
+        if Size < len(BookHeader) or (Size-len(BookHeader)) % RecordSize != 0:
+            self.File.close()
+            raise ValueError('%s is not a book file' % FileName)
+        self.Count = (Size-len(BookHeader)) // RecordSize
+        self.Map = None
+        if self.Count > 0:
+            self.Map = mmap.mmap(self.File.fileno(), 0, access=mmap.ACCESS_READ)
+            if self.Map[:len(BookHeader)] != BookHeader:
+                self.Close()
+                raise ValueError('%s is not a book file' % FileName)
+
+    # to close the file
+    def Close(self):
+        if self.Map is not None:
+            self.Map.close()
+            self.Map = None
+        self.File.close()
+
+    # to find the square of a key
+    def Find(self, Key):
+        '''To get the book square of the Key by bisection, -1 if the Key is
+        not in the book'''
+        Target = Key.to_bytes(16, 'big')
+        Low = 0
+        High = self.Count
+        while Low < High:
+            Middle = (Low+High) // 2
+            Start = len(BookHeader)+Middle*RecordSize
+            Record = self.Map[Start:Start+16]
+            if Record < Target:
+                Low = Middle+1
+            elif Record > Target:
+                High = Middle
+            else:
+                return self.Map[Start+16]
+        return -1
+
+    # to find the book move of a position
+    def Lookup(self, Colour, Board):
+        '''To get the book move (x,y) of the Colour on the Board, None when
+        the position is not in the book'''
+        if self.Count == 0:
+            return None
+        Own, Opp = BoardToBits(Colour, Board)
+        (Key, t) = BookKey(Own, Opp)
+        Square = self.Find(Key)
+        if Square < 0:
+            return None
+        return RestoreMove(BitCell[Square], t)
+
+# to build a book by self-play
+def BuildBook(FileName, PlayerWhite=player1, PlayerBlack=player1, Games=1000,
+              Depth=12, MinGames=2):
+    '''To build the book file FileName from Games games of PlayGame between
+    PlayerWhite and PlayerBlack. For every position of the first Depth
+    moves played in at least MinGames games, the book move is the move with
+    the best average result for the player who played it. The number of
+    positions in the book is returned.'''
+    Stats = {}
+    Played = []
+    def Recorder(Player):
+        def player(Colour, Board):
+            Move = Player(Colour, Board)
+            if len(Played) < Depth and ValidCell(Move[0], Move[1]):
+                Own, Opp = BoardToBits(Colour, Board)
+                (Key, t) = BookKey(Own, Opp)
+                Played.append((Colour, Key, SymmetrySquare[t][(Move[0]-1)*8+Move[1]-1]))
+            return Move
+        return player
+    RecordWhite = Recorder(PlayerWhite)
+    RecordBlack = Recorder(PlayerBlack)
+    for Game in range(Games):
+        del Played[:]
+        (Board, Result, PlayTime, Error) = PlayGame(RecordWhite, RecordBlack)
+        if abs(Result) > 1000:
+            continue
+        for (Colour, Key, Square) in Played:
+            Moves = Stats.setdefault(Key, {})
+            (Count, Total) = Moves.get(Square, (0, 0))
+            Moves[Square] = (Count+1, Total+Result*Colour)
+    Entries = {}
+    for Key, Moves in Stats.items():
+        if sum(Count for (Count, Total) in Moves.values()) < MinGames:
+            continue
+        Entries[Key] = max(Moves, key=lambda Square: Moves[Square][1]/Moves[Square][0])
+    WriteBook(FileName, Entries)
+    return len(Entries)
+
+# the book used by BookMove, opened at the first call
+DefaultBook = None
+
+# to get the book move for a player function
+def BookMove(Colour, Board):
+    '''To get the move (x,y) of BookFile for the Colour on the Board, None
+    when the position is not in the book or there is no book file'''
+    global DefaultBook
+    if DefaultBook is None:
+        if not os.path.exists(BookFile):
+            return None
+        DefaultBook = OpeningBook(BookFile)
+    return DefaultBook.Lookup(Colour, Board)
+
+if __name__ == '__main__':
+    print(BuildBook(BookFile, Games=20000), 'positions written to', BookFile)
@@ -0,0 +1,106 @@
+# Module for Python course project V3.0 2025
+# This module counts the positions reached from BoardInit() (perft) with
+# every move generator of Reversi, to check that they agree and to compare
+# their speed
+#   python perft.py [depth]
+# A pass is one move as in PlayGame, where a player with no possible move
+# is skipped, and a finished game (no move for both) is a leaf.
+
+from Reversi import *
+import sys
+import time
+
+# perft with the PossibleMove and PlaceMove of a board backend
+def BoardPerft(Backend, Colour, Board, Depth):
+    '''To count the leaves Depth moves below the Board, the Colour to move,
+    with the functions of Backends[Backend]'''
+    if Depth == 0:
+        return 1
+    (Moves, Place) = Backends[Backend]
+    a = Moves(Colour, Board)
+    if len(a) == 0:
+        if len(Moves(-1*Colour, Board)) == 0:
+            return 1
+        return BoardPerft(Backend, -1*Colour, Board, Depth-1)
+    Count = 0
+    for (x, y) in a:
+        Count += BoardPerft(Backend, -1*Colour, Place(Colour, BoardCopy(Board), x, y), Depth-1)
+    return Count
+
+# perft with Position, playing and taking back the moves on one board
+def PositionPerft(Position, Depth):
+    '''To count the leaves Depth moves below the Position, playing and
+    taking back the moves on its board'''
+    if Depth == 0:
+        return 1
+    a = Position.Moves()
+    if len(a) == 0:
+        if len(Position.Moves(-1*Position.Player)) == 0:
+            return 1
+        Position.Pass()
+        Count = PositionPerft(Position, Depth-1)
+        Position.Undo()
+        return Count
+    Count = 0
+    for (x, y) in a:
+        Position.Play(x, y)
+        Count += PositionPerft(Position, Depth-1)
+        Position.Undo()
+    return Count
+
+# perft on the bitboards
+def BitPerft(Own, Opp, Depth):
+    '''To count the leaves Depth moves below the position of the player
+    owning Own, to move'''
+    if Depth == 0:
+        return 1
+    Moves = BitMoves(Own, Opp)
+    if not Moves:
+        if not BitMoves(Opp, Own):
+            return 1
+        return BitPerft(Opp, Own, Depth-1)
+    if Depth == 1:
+        return BitCount(Moves)
+    Count = 0
+    while Moves:
+        Low = Moves & -Moves
+        Flips = BitFlips(Own, Opp, Low.bit_length()-1)
+        Count += BitPerft(Opp ^ Flips, Own | Flips | Low, Depth-1)
+        Moves ^= Low
+    return Count
+
+# the move generators to compare: name -> function of the depth
+Generators = {}
+for Name in Backends:
+    Generators[Name] = lambda Depth, Name=Name: BoardPerft(Name, White, BoardInit(), Depth)
+Generators['position'] = lambda Depth: PositionPerft(Position(), Depth)
+Generators['bits'] = lambda Depth: BitPerft(*BitBoardInit(White), Depth)
+
+# to run perft with every generator
+def Perft(Depth, Names=None):
+    '''To count the leaves at every depth up to Depth with every generator
+    (or those in Names), print the counts and nodes/sec, and flag the
+    depths where the generators disagree. The return value is True when
+    all the counts agree.'''
+    if Names is None:
+        Names = list(Generators)
+    Agree = True
+    print('%5s %-10s %12s %12s' % ('depth', 'generator', 'leaves', 'nodes/sec'))
+    for d in range(1, Depth+1):
+        Counts = {}
+        for Name in Names:
+            StartTime = time.perf_counter()
+            Counts[Name] = Generators[Name](d)
+            Used = time.perf_counter()-StartTime
+            print('%5d %-10s %12d %12.0f' % (d, Name, Counts[Name], Counts[Name]/max(Used, 1e-9)))
+        if len(set(Counts.values())) > 1:
+            Agree = False
+            print('depth %d: the generators DISAGREE: %s' % (d, Counts))
+    return Agree
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        Depth = int(sys.argv[1])
+    else:
+        Depth = 6
+    sys.exit(0 if Perft(Depth) else 1)
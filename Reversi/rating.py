@@ -0,0 +1,121 @@
+# Module for Python course project V3.0 2025
+# This module rates player functions from the results of their games
+# The ratings are those of the Bradley-Terry model fitted by maximum
+# likelihood, on the Elo scale, a draw being counted as half a win. The
+# next games are chosen where the ratings are the most uncertain.
+
+import math
+
+# the Elo points of a factor e in the strength of the model
+EloScale = 400/math.log(10)
+
+# the rating of a player of average strength
+EloBase = 1500
+
+# the normal quantile of the 95% confidence intervals
+Z95 = 1.96
+
+# the ratings of the players of a competition
+class Ratings:
+    '''The games between Count players and their Bradley-Terry ratings.
+    Every player has Prior draws against a virtual player of rating
+    EloBase, so that a player who won or lost all his games still gets a
+    finite rating. Rating and Error (the standard error, both in Elo
+    points) are those of the last Fit.'''
+
+    def __init__(self, Count, Prior=1):
+        self.Count = Count
+        self.Prior = Prior
+        self.Games = [[0]*Count for i in range(Count)]
+        self.Wins = [0.0]*Count
+        self.Strength = [1.0]*Count
+        self.Rating = [EloBase]*Count
+        self.Error = [EloScale*math.sqrt(2/Prior)]*Count
+
+    # to add the result of a game
+    def Add(self, Player, Opponent, Score):
+        '''To add a game of the Player against the Opponent, Score being 1
+        for a win of the Player, 0.5 for a draw and 0 for a loss'''
+        self.Games[Player][Opponent] = self.Games[Player][Opponent]+1
+        self.Games[Opponent][Player] = self.Games[Opponent][Player]+1
+        self.Wins[Player] = self.Wins[Player]+Score
+        self.Wins[Opponent] = self.Wins[Opponent]+1-Score
+
+    # the number of games of a player
+    def Played(self, Player):
+        return sum(self.Games[Player])
+
+    # to fit the ratings to the games
+    def Fit(self, Iterations=1000, Tolerance=1e-9):
+        '''To compute the maximum likelihood strengths with the MM algorithm
+        (Hunter 2004), then Rating and Error from them'''
+        g = self.Strength
+        for Iteration in range(Iterations):
+            New = []
+            for i in range(self.Count):
+                Sum = self.Prior/(g[i]+1)
+                for j in range(self.Count):
+                    if self.Games[i][j]:
+                        Sum = Sum+self.Games[i][j]/(g[i]+g[j])
+                New.append((self.Wins[i]+self.Prior/2)/Sum)
+            Change = max(abs(math.log(New[i]/g[i])) for i in range(self.Count))
+            g = New
+            if Change < Tolerance:
+                break
+        self.Strength = g
+        self.Rating = [EloBase+EloScale*math.log(g[i]) for i in range(self.Count)]
+        # the standard errors from the diagonal of the Fisher information
+        self.Error = []
+        for i in range(self.Count):
+            Information = self.Prior*g[i]/(g[i]+1)**2
+            for j in range(self.Count):
+                if self.Games[i][j]:
+                    Information = Information+self.Games[i][j]*g[i]*g[j]/(g[i]+g[j])**2
+            self.Error.append(EloScale/math.sqrt(Information))
+
+    # the confidence interval of a rating
+    def Interval(self, Player):
+        '''To get (Low, High): the 95% confidence interval of the rating of
+        the Player'''
+        return (self.Rating[Player]-Z95*self.Error[Player],
+                self.Rating[Player]+Z95*self.Error[Player])
+
+    # the expected score of a game
+    def Expected(self, Player, Opponent):
+        g = self.Strength
+        return g[Player]/(g[Player]+g[Opponent])
+
+    # the players from the best rating
+    def Ranking(self, Players):
+        return sorted(Players, key=lambda Player: -self.Rating[Player])
+
+    # to choose the next games
+    def Pairs(self, Players):
+        '''To pair the Players for the next games, every player at most
+        once: the pairs with the most uncertain result and ratings first,
+        the priority of a pair being p(1-p) times the sum of the variances
+        of the two ratings, p being the expected score, divided by one more
+        than the games already played between them'''
+        Candidates = []
+        for a in range(len(Players)):
+            for b in range(a+1, len(Players)):
+                (i, j) = (Players[a], Players[b])
+                p = self.Expected(i, j)
+                Priority = p*(1-p)*(self.Error[i]**2+self.Error[j]**2)/(1+self.Games[i][j])
+                Candidates.append((Priority, i, j))
+        Candidates.sort(reverse=True)
+        Paired = set()
+        Pairs = []
+        for (Priority, i, j) in Candidates:
+            if i not in Paired and j not in Paired:
+                Pairs.append((i, j))
+                Paired.add(i)
+                Paired.add(j)
+        return Pairs
+
+# the change between two rankings
+def RankShift(Previous, Current):
+    '''To get the most places gained or lost by a player from the ranking
+    Previous to the ranking Current, both lists of the same players'''
+    Place = {Player: k for (k, Player) in enumerate(Previous)}
+    return max([abs(Place[Player]-k) for (k, Player) in enumerate(Current)] + [0])
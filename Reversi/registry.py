@@ -0,0 +1,75 @@
+# Module for Python course project V3.0 2025
+# This module loads the player functions lazily for a competition
+# A player module is imported only before its first game, in at most
+# ImportLimit seconds, and the time of the import is kept for the report.
+# Nothing is loaded in advance: every process imports the modules of its
+# own games when it needs them.
+
+from sandbox import ImportLimit, SandboxPlayer
+import importlib
+import time
+
+# to import a player function with a time limit
+def ImportPlayer(Path, Name, Limit=ImportLimit):
+    '''Function, ImportTime = ImportPlayer(Path, Name, Limit)
+
+    To get the player function of the module Name in Path. The module is
+    first imported by a SandboxPlayer in a child process, which is
+    terminated after Limit seconds, and an exception is raised when that
+    import fails or does not finish in time. Only then is the module
+    imported in this process, so a slow module leaves nothing running
+    here; that import is held to Limit as well, once it is done. ImportTime
+    is the time of the import in the child process, the module alone
+    without the start of the process.'''
+    Probe = SandboxPlayer(Path, Name)
+    try:
+        Probe.Start(Limit)
+    finally:
+        Probe.Stop()
+    StartTime = time.perf_counter()
+    Function = importlib.import_module(Name).player
+    if time.perf_counter()-StartTime > Limit:
+        raise Exception('%s is not imported in %.1f s' % (Name, Limit))
+    return Function, Probe.ImportTime
+
+# a player function imported at its first use
+class LazyPlayer:
+    '''A player function (x,y) = LazyPlayer(Colour, Board) of the module
+    Name in Path. The module is imported by Load, or at the first call,
+    and ImportTime is the time of the import of the module in seconds,
+    None until it is imported. With Sandbox=True the player runs in its
+    own process as a SandboxPlayer, started by Load. An import error is
+    kept in Error and raised again by every Load, ImportTime staying None.'''
+
+    def __init__(self, Path, Name, Limit=ImportLimit, Sandbox=False):
+        self.Path = Path
+        self.Name = Name
+        self.Limit = Limit
+        self.Sandbox = Sandbox
+        self.Function = None
+        self.ImportTime = None
+        self.Error = None
+
+    # to import the player module
+    def Load(self):
+        '''To import the player module, if not yet done'''
+        if self.Error is not None:
+            raise Exception(self.Error)
+        if self.Function is not None:
+            return
+        try:
+            if self.Sandbox:
+                Function = SandboxPlayer(self.Path, self.Name)
+                Function.Start(self.Limit)
+                ImportTime = Function.ImportTime
+            else:
+                (Function, ImportTime) = ImportPlayer(self.Path, self.Name, self.Limit)
+        except Exception as e:
+            self.Error = str(e)
+            raise
+        self.Function = Function
+        self.ImportTime = ImportTime
+
+    def __call__(self, Colour, Board):
+        self.Load()
+        return self.Function(Colour, Board)
@@ -3,11 +3,21 @@
 
 import random
 import time
-import copy
+import tracemalloc
+from itertools import chain
 
 # Error Code for Player
 IllegalMove, PlayerError, PlayerSlow, NoMove = [1001, 1002, 1003, 1004]
 
+# time limit for one move in seconds, a slower player is a PlayerSlow
+TimeLimit = 1.5
+
+# the exception of a player function stopped at the time limit
+class PlayerTimeout(Exception):
+    '''Raised by a player function which is cut off at the time limit, for
+    example a SandboxPlayer. PlayGame reports it as PlayerSlow.'''
+    pass
+
 # list for identifing the "next cell"
 NeighbourDirection1 = ['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW']
 NeighbourPosition = [(0, -1), (1, -1), (1, 0), (1, 1), (0, 1),
@@ -33,8 +43,9 @@ def BoardInit():
 
 # to copy a board
 def BoardCopy(Board):
-    """To duplicate a board to a new one"""
-    return copy.deepcopy(Board)
+    """To duplicate a board to a new one. The rows are copied by slicing
+    which is much faster than copy.deepcopy for a grid of int"""
+    return list(map(list, Board))
 
 # to check if the the cell (x,y) is within the board
 def ValidCell(x, y):
@@ -58,8 +69,8 @@ def NeighbourCell(Board, Direction, x, y):
         [y+NeighbourDirection[Direction][1]]
 
 
-# to find all possible move for the player
-def PossibleMove(Player, Board):
+# to find all possible move for the player (list backend)
+def ListPossibleMove(Player, Board):
     '''To get all of the possible next move for the player on the current
     Board. The return value will be a list content all the (x,y) of possible
     moves'''
@@ -90,8 +101,8 @@ def PossibleMove(Player, Board):
                     break
     return ReturnValue
 
-# to place the move on the board
-def PlaceMove(Player, Board, x, y):
+# to place the move on the board (list backend)
+def ListPlaceMove(Player, Board, x, y):
     '''To place a new piece on the cell(x,y) of the Board for the Player. Then,
     all the non-player's pieces lying on a straight line between the new piece
     and any anchoring Player's pieces.'''
@@ -128,6 +139,573 @@ def PlaceMove(Player, Board, x, y):
                 break
     return Board
     
+# bitboard backend: the 64 playing cells are packed into one integer per
+# colour, cell (x,y) is held in bit (x-1)*8+(y-1)
+BitFull = 0xFFFFFFFFFFFFFFFF
+BitNotFirst = 0xFEFEFEFEFEFEFEFE  # all cells except y == 1
+BitNotLast = 0x7F7F7F7F7F7F7F7F   # all cells except y == 8
+
+# (shift, mask) for each of the directions in NeighbourPosition order, the
+# mask drops the bits wrapped around the edge of the board after shifting
+BitDirections = []
+for (dx, dy) in NeighbourPosition:
+    if dy == 1:
+        BitDirections.append((dx*8+dy, BitNotFirst))
+    elif dy == -1:
+        BitDirections.append((dx*8+dy, BitNotLast))
+    else:
+        BitDirections.append((dx*8+dy, BitFull))
+BitDirections = tuple(BitDirections)
+
+# the cell (x,y) of each bit
+BitCell = tuple(((Square >> 3)+1, (Square & 7)+1) for Square in range(64))
+
+# the bits of the (up to 8) cells around each bit
+BitNeighbours = tuple(sum(1 << ((x+dx-1)*8+(y+dy-1))
+                          for (dx, dy) in NeighbourPosition
+                          if ValidCell(x+dx, y+dy))
+                      for (x, y) in BitCell)
+
+# the bits of Black and White for every possible content of a row, made
+# by MakeBitRows at the first use
+BitRows = None
+
+# to make BitRows
+def MakeBitRows():
+    '''To make BitRows, the 3**8 rows, at the first conversion of a board
+    rather than in every process importing the module'''
+    global BitRows
+    Rows = {}
+    for Row in range(3**8):
+        Cells = []
+        BlackBits = 0
+        WhiteBits = 0
+        for y in range(8):
+            Cells.append((Empty, Black, White)[Row % 3])
+            if Cells[y] == Black:
+                BlackBits |= 1 << y
+            elif Cells[y] == White:
+                WhiteBits |= 1 << y
+            Row //= 3
+        Rows[tuple(Cells)] = (BlackBits, WhiteBits)
+    BitRows = Rows
+    return Rows
+
+# to convert a board to the bitboards of the Player and his opponent
+def BoardToBits(Player, Board):
+    '''To pack the Board into two integers (Own, Opp) holding the pieces of
+    the Player and of his opponent'''
+    Rows = BitRows
+    if Rows is None:
+        Rows = MakeBitRows()
+    BlackBits = 0
+    WhiteBits = 0
+    for x in range(1, 9):
+        (b, w) = Rows[tuple(Board[x][1:9])]
+        BlackBits |= b << ((x-1)*8)
+        WhiteBits |= w << ((x-1)*8)
+    if Player == Black:
+        return BlackBits, WhiteBits
+    return WhiteBits, BlackBits
+
+# to convert the bitboards back to a 10 X 10 board
+def BitsToBoard(Player, Own, Opp):
+    '''To unpack the bitboards of the Player (Own) and his opponent (Opp)
+    into a new 10 X 10 board as created by BoardInit'''
+    Board = list(list(0 for x in range(10)) for y in range(10))
+    for Square in range(64):
+        Bit = 1 << Square
+        (x, y) = BitCell[Square]
+        if Own & Bit:
+            Board[x][y] = Player
+        elif Opp & Bit:
+            Board[x][y] = -1*Player
+    return Board
+
+# to convert a bit set into the list of cells
+def BitsToCells(Bits):
+    '''To list the (x,y) of every bit set in Bits, in the same order as
+    PossibleMove scans the board'''
+    ReturnValue = []
+    while Bits:
+        Low = Bits & -Bits
+        ReturnValue.append(BitCell[Low.bit_length()-1])
+        Bits ^= Low
+    return ReturnValue
+
+# to create the bitboards of a new game
+def BitBoardInit(Player=White):
+    '''To get (Own, Opp) of the new game board for the Player. White moves
+    first in PlayGame.'''
+    return BoardToBits(Player, BoardInit())
+
+# to find all possible move on the bitboards
+def BitMoves(Own, Opp):
+    '''To get the bit set of every possible move for the player owning the
+    pieces in Own against the pieces in Opp'''
+    Empties = ~(Own | Opp) & BitFull
+    Moves = 0
+    for Shift, Mask in BitDirections:
+        Line = Mask & Opp
+        if Shift > 0:
+            Flip = (Own << Shift) & Line
+            Flip |= (Flip << Shift) & Line
+            Flip |= (Flip << Shift) & Line
+            Flip |= (Flip << Shift) & Line
+            Flip |= (Flip << Shift) & Line
+            Flip |= (Flip << Shift) & Line
+            Moves |= (Flip << Shift) & Mask & Empties
+        else:
+            Shift = -Shift
+            Flip = (Own >> Shift) & Line
+            Flip |= (Flip >> Shift) & Line
+            Flip |= (Flip >> Shift) & Line
+            Flip |= (Flip >> Shift) & Line
+            Flip |= (Flip >> Shift) & Line
+            Flip |= (Flip >> Shift) & Line
+            Moves |= (Flip >> Shift) & Mask & Empties
+    return Moves
+
+# to find the pieces flipped by a move on the bitboards
+def BitFlips(Own, Opp, Square):
+    '''To get the bit set of the opponent pieces flipped when the player
+    owning Own places a piece on the bit Square'''
+    Flips = 0
+    Start = 1 << Square
+    for Shift, Mask in BitDirections:
+        Line = 0
+        if Shift > 0:
+            Bit = (Start << Shift) & Mask
+            while Bit & Opp:
+                Line |= Bit
+                Bit = (Bit << Shift) & Mask
+        else:
+            Bit = (Start >> -Shift) & Mask
+            while Bit & Opp:
+                Line |= Bit
+                Bit = (Bit >> -Shift) & Mask
+        if Bit & Own:
+            Flips |= Line
+    return Flips
+
+# the 8 symmetries of the board: cell (x,y) is moved to Symmetries[t](x,y),
+# with x and y counted from 0 to 7
+Symmetries = (lambda x, y: (x, y), lambda x, y: (y, x),
+              lambda x, y: (7-x, y), lambda x, y: (x, 7-y),
+              lambda x, y: (7-x, 7-y), lambda x, y: (y, 7-x),
+              lambda x, y: (7-y, x), lambda x, y: (7-y, 7-x))
+
+# the bit each bit is moved to by each symmetry
+SymmetrySquare = tuple(tuple(Symmetry(Square >> 3, Square & 7)[0]*8+Symmetry(Square >> 3, Square & 7)[1]
+                             for Square in range(64))
+                       for Symmetry in Symmetries)
+
+# the symmetry taking back each symmetry
+SymmetryInverse = tuple([u for u in range(8)
+                         if all(SymmetrySquare[u][SymmetrySquare[t][Square]] == Square
+                                for Square in range(64))][0]
+                        for t in range(8))
+
+# the bits each byte of each row is moved to by each symmetry, so that a
+# bitboard is moved with 8 lookups, made by MakeSymmetryRows at the first use
+SymmetryRows = None
+
+# to make SymmetryRows
+def MakeSymmetryRows():
+    '''To make SymmetryRows at the first symmetry of a bitboard, only the
+    opening book and the symmetric search need it'''
+    global SymmetryRows
+    SymmetryRows = tuple(tuple(tuple(sum(1 << SymmetrySquare[t][x*8+y] for y in range(8) if Byte >> y & 1)
+                                     for Byte in range(256))
+                               for x in range(8))
+                         for t in range(8))
+    return SymmetryRows
+
+# to move a bitboard by a symmetry
+def BitTransform(Bits, t):
+    '''To get the bitboard Bits moved by the symmetry t (0 to 7) of the
+    board, SymmetryInverse[t] moves it back'''
+    Rows = SymmetryRows
+    if Rows is None:
+        Rows = MakeSymmetryRows()
+    Rows = Rows[t]
+    return Rows[0][Bits & 0xFF] | Rows[1][(Bits >> 8) & 0xFF] | \
+           Rows[2][(Bits >> 16) & 0xFF] | Rows[3][(Bits >> 24) & 0xFF] | \
+           Rows[4][(Bits >> 32) & 0xFF] | Rows[5][(Bits >> 40) & 0xFF] | \
+           Rows[6][(Bits >> 48) & 0xFF] | Rows[7][Bits >> 56]
+
+# to move a position to its canonical symmetry
+def CanonicalBits(Own, Opp):
+    '''To get (Own, Opp, t): the position moved by the symmetry t which
+    gives the smallest (Own << 64 | Opp) of its 8 symmetric positions. All
+    the symmetric positions have the same canonical position.'''
+    Best = None
+    for t in range(8):
+        NewOwn = BitTransform(Own, t)
+        NewOpp = BitTransform(Opp, t)
+        if Best is None or NewOwn < Best[0] or (NewOwn == Best[0] and NewOpp < Best[1]):
+            Best = (NewOwn, NewOpp, t)
+    return Best
+
+# the random numbers of the hash, for the bytes of each row of each side,
+# made with a fixed seed so that a hash is the same in every process
+HashRows = []
+HashRandom = random.Random(2025)
+for Side in range(2):
+    HashRows.append(tuple(tuple([0]+[HashRandom.getrandbits(64) for Byte in range(1, 256)])
+                          for x in range(8)))
+HashRows = tuple(HashRows)
+del HashRandom
+
+# the hash of the bitboards
+def BitHash(Own, Opp):
+    '''To get the 64 bits hash of the position of the player owning Own'''
+    Hash = 0
+    for x in range(8):
+        Hash ^= HashRows[0][x][(Own >> (x*8)) & 0xFF] ^ HashRows[1][x][(Opp >> (x*8)) & 0xFF]
+    return Hash
+
+# the hash of the bitboards, the same for the symmetric positions
+def BitCanonicalHash(Own, Opp):
+    '''To get (Hash, t): the BitHash of the canonical position and the
+    symmetry t moving the position to it'''
+    (Own, Opp, t) = CanonicalBits(Own, Opp)
+    return BitHash(Own, Opp), t
+
+# the hash of a board, the same for the symmetric positions
+def CanonicalHash(Player, Board):
+    '''To get (Hash, t): the 64 bits hash of the Board with the Player to
+    move, the same for its rotated and reflected boards, and the symmetry t
+    moving the Board to the canonical one. A move found for the canonical
+    board is mapped back by RestoreMove(Move, t).'''
+    Own, Opp = BoardToBits(Player, Board)
+    return BitCanonicalHash(Own, Opp)
+
+# to move a cell by a symmetry
+def TransformMove(Move, t):
+    '''To get the cell (x,y) of the Move on the board moved by the symmetry
+    t, e.g. from a board to its canonical board'''
+    (x, y) = Move
+    if not ValidCell(x, y):
+        return Move
+    return BitCell[SymmetrySquare[t][(x-1)*8+y-1]]
+
+# to move a cell back from a symmetry
+def RestoreMove(Move, t):
+    '''To get the cell (x,y) of the Move, given on the board moved by the
+    symmetry t, on the original board'''
+    return TransformMove(Move, SymmetryInverse[t])
+
+# to find all possible move for the player (bitboard backend)
+def BitPossibleMove(Player, Board):
+    '''Same as ListPossibleMove, computed on the bitboards'''
+    Own, Opp = BoardToBits(Player, Board)
+    return BitsToCells(BitMoves(Own, Opp))
+
+# to place the move on the board (bitboard backend)
+def BitPlaceMove(Player, Board, x, y):
+    '''Same as ListPlaceMove, the flipped pieces are found on the bitboards
+    and only those cells of the Board are written. Like ListPlaceMove, the
+    piece is also placed when it only touches one of the Player's pieces.'''
+    if not ValidCell(x, y):
+        return ListPlaceMove(Player, Board, x, y)
+    Own, Opp = BoardToBits(Player, Board)
+    Square = (x-1)*8+(y-1)
+    Flips = BitFlips(Own, Opp, Square)
+    if Flips or BitNeighbours[Square] & Own:
+        Board[x][y] = Player
+        for (xf, yf) in BitsToCells(Flips):
+            Board[xf][yf] = Player
+    return Board
+
+# to count the bits set
+def BitCount(Bits):
+    '''To get the number of bits set in Bits, e.g. the number of pieces'''
+    return bin(Bits).count('1')
+
+# to find all possible move with its flipped pieces on the bitboards
+def BitMoveFlips(Own, Opp):
+    '''To get [(Square, Flips), ...] for every possible move of the player
+    owning Own, Flips being the bit set of the pieces it flips'''
+    ReturnValue = []
+    Moves = BitMoves(Own, Opp)
+    while Moves:
+        Low = Moves & -Moves
+        Square = Low.bit_length()-1
+        ReturnValue.append((Square, BitFlips(Own, Opp, Square)))
+        Moves ^= Low
+    return ReturnValue
+
+# to get the possible moves of the player as a bit mask
+def LegalMask(Player, Board):
+    '''To get the possible moves of the Player on the Board as one integer,
+    the cell (x,y) is the bit (x-1)*8+(y-1)'''
+    Own, Opp = BoardToBits(Player, Board)
+    return BitMoves(Own, Opp)
+
+# to find all possible move with the pieces they flip
+def MoveFlips(Player, Board):
+    '''To get all of the possible next move for the player on the current
+    Board together with the pieces they flip, in one pass. The return value
+    is a list of ((x,y), Count, Flips) in the order of PossibleMove, Flips
+    being the list of the (x,y) flipped and Count its length.'''
+    Own, Opp = BoardToBits(Player, Board)
+    ReturnValue = []
+    for Square, Flips in BitMoveFlips(Own, Opp):
+        Cells = BitsToCells(Flips)
+        ReturnValue.append((BitCell[Square], len(Cells), Cells))
+    return ReturnValue
+
+# to count the pieces flipped by every possible move
+def FlipCount(Player, Board):
+    '''To get {(x,y): number of pieces flipped} for every possible move of
+    the Player on the Board'''
+    Own, Opp = BoardToBits(Player, Board)
+    ReturnValue = {}
+    for Square, Flips in BitMoveFlips(Own, Opp):
+        ReturnValue[BitCell[Square]] = BitCount(Flips)
+    return ReturnValue
+
+# ray backend: the board is read as a flat list of 100 cells, cell (x,y)
+# being the index x*10+y, and the cells along every direction from every
+# cell are listed once at import
+RayIndex = tuple(x*10+y for x in range(1, 9) for y in range(1, 9))
+
+# the cell (x,y) of each index of the flat board
+RayCell = dict((x*10+y, (x, y)) for x in range(1, 9) for y in range(1, 9))
+
+# the rays of each cell: for the 8 directions in NeighbourPosition order,
+# the tuple of the indices from the next cell to the edge of the board
+RayTable = {}
+for (x, y) in BitCell:
+    Rays = []
+    for (dx, dy) in NeighbourPosition:
+        Ray = []
+        xcurrent = x+dx
+        ycurrent = y+dy
+        while ValidCell(xcurrent, ycurrent):
+            Ray.append(xcurrent*10+ycurrent)
+            xcurrent = xcurrent+dx
+            ycurrent = ycurrent+dy
+        Rays.append(tuple(Ray))
+    RayTable[x*10+y] = tuple(Rays)
+
+# the rays which can hold a move: at least one piece to flip and an anchor
+RayMoveTable = tuple((Index, RayCell[Index], tuple(Ray for Ray in RayTable[Index] if len(Ray) > 1))
+                     for Index in RayIndex)
+
+# to find all possible move for the player (ray backend)
+def RayPossibleMove(Player, Board):
+    '''Same as ListPossibleMove, walking the precomputed rays of a flat
+    copy of the Board'''
+    return RayFlatMoves(Player, list(chain.from_iterable(Board)))
+
+# to find all possible move for the player on a flat board
+def RayFlatMoves(Player, Flat):
+    '''To get the possible moves (x,y) of the Player on the flat board Flat,
+    the list of the 100 cells, cell (x,y) at the index x*10+y'''
+    Opponent = -1*Player
+    ReturnValue = []
+    for (Index, Cell, Rays) in RayMoveTable:
+        if Flat[Index] != Empty:
+            continue
+        for Ray in Rays:
+            if Flat[Ray[0]] != Opponent:
+                continue
+            for i in Ray:
+                Content = Flat[i]
+                if Content != Opponent:
+                    break
+            if Content == Player:
+                ReturnValue.append(Cell)
+                break
+    return ReturnValue
+
+# to place the move on the board (ray backend)
+def RayPlaceMove(Player, Board, x, y):
+    '''Same as ListPlaceMove, walking the precomputed rays of a flat copy
+    of the Board and writing only the flipped cells'''
+    if not ValidCell(x, y):
+        return ListPlaceMove(Player, Board, x, y)
+    Flat = list(chain.from_iterable(Board))
+    Opponent = -1*Player
+    Anchored = False
+    Flipped = []
+    for Ray in RayTable[x*10+y]:
+        Count = 0
+        for i in Ray:
+            Content = Flat[i]
+            if Content != Opponent:
+                break
+            Count = Count+1
+        else:
+            continue
+        if Content == Player:
+            Anchored = True
+            Flipped.extend(Ray[:Count])
+    if Anchored:
+        Board[x][y] = Player
+        for i in Flipped:
+            Board[i // 10][i % 10] = Player
+    return Board
+
+# the board backends: name -> (PossibleMove, PlaceMove)
+Backends = {'list': (ListPossibleMove, ListPlaceMove),
+            'bitboard': (BitPossibleMove, BitPlaceMove),
+            'ray': (RayPossibleMove, RayPlaceMove)}
+Backend = 'ray'
+
+# to select the backend used by PossibleMove and PlaceMove
+def SetBackend(Name):
+    '''To select the board backend ('list', 'bitboard' or 'ray') used by
+    PossibleMove and PlaceMove. All backends give the same results.'''
+    global Backend
+    if Name not in Backends:
+        raise ValueError('unknown backend %s' % Name)
+    Backend = Name
+
+# to find all possible move for the player
+def PossibleMove(Player, Board):
+    '''To get all of the possible next move for the player on the current
+    Board. The return value will be a list content all the (x,y) of possible
+    moves'''
+    return Backends[Backend][0](Player, Board)
+
+# to place the move on the board
+def PlaceMove(Player, Board, x, y):
+    '''To place a new piece on the cell(x,y) of the Board for the Player. Then,
+    all the non-player's pieces lying on a straight line between the new piece
+    and any anchoring Player's pieces.'''
+    return Backends[Backend][1](Player, Board, x, y)
+
+# to place a move and get the pieces flipped
+def MakeMove(Player, Board, x, y):
+    '''To place a new piece on the cell(x,y) of the Board for the Player and
+    flip the opponent pieces, like PlaceMove. The return value is the list
+    of the (x,y) flipped, which UnmakeMove uses to take the move back. A
+    move flipping nothing is not placed and [] is returned.'''
+    Flipped = []
+    Opponent = -1*Player
+    for (dx, dy) in NeighbourPosition:
+        xcurrent = x+dx
+        ycurrent = y+dy
+        if Board[xcurrent][ycurrent] != Opponent:
+            continue
+        while Board[xcurrent][ycurrent] == Opponent:
+            xcurrent = xcurrent+dx
+            ycurrent = ycurrent+dy
+        if Board[xcurrent][ycurrent] == Player:
+            # walk back to the move, the cells passed are flipped
+            xcurrent = xcurrent-dx
+            ycurrent = ycurrent-dy
+            while xcurrent != x or ycurrent != y:
+                Flipped.append((xcurrent, ycurrent))
+                xcurrent = xcurrent-dx
+                ycurrent = ycurrent-dy
+    if Flipped:
+        Board[x][y] = Player
+        for (xf, yf) in Flipped:
+            Board[xf][yf] = Player
+    return Flipped
+
+# to take back a move
+def UnmakeMove(Player, Board, x, y, Flipped):
+    '''To take back the move (x,y) of the Player, Flipped being the list
+    returned by MakeMove'''
+    if Flipped:
+        Board[x][y] = Empty
+        Opponent = -1*Player
+        for (xf, yf) in Flipped:
+            Board[xf][yf] = Opponent
+
+# a board with the player to move and the moves to take back
+class Position:
+    '''A game position for searching: the Board, the Player to move and the
+    moves played. Play and Pass change the one Board in place, Undo takes
+    back the last of them. The moves are found on Flat, a flat copy of the
+    Board (cell (x,y) at the index x*10+y) kept up to date with it. The
+    flipped cells go to the one list Flips and the Stack keeps the index
+    and the number of flips of every move, so nothing is allocated for a
+    move but the list of the possible moves.'''
+
+    def __init__(self, Board=None, Player=White):
+        if Board is None:
+            self.Board = BoardInit()
+        else:
+            self.Board = BoardCopy(Board)
+        self.Flat = list(chain.from_iterable(self.Board))
+        self.Player = Player
+        self.Flips = []
+        self.Stack = []
+
+    # to find all possible move for a player, by default the player to move
+    def Moves(self, Player=None):
+        if Player is None:
+            Player = self.Player
+        return RayFlatMoves(Player, self.Flat)
+
+    # to play the move (x,y) for the player to move
+    def Play(self, x, y):
+        '''To play the move (x,y) and get the number of pieces flipped. A
+        move flipping nothing is not placed, as with MakeMove.'''
+        Flat = self.Flat
+        Board = self.Board
+        Flips = self.Flips
+        Player = self.Player
+        Opponent = -1*Player
+        Index = x*10+y
+        Start = len(Flips)
+        for Ray in RayTable[Index]:
+            for i in Ray:
+                Content = Flat[i]
+                if Content != Opponent:
+                    break
+            else:
+                continue
+            if Content == Player and Flat[Ray[0]] == Opponent:
+                for i in Ray:
+                    if Flat[i] != Opponent:
+                        break
+                    Flat[i] = Player
+                    Board[i // 10][i % 10] = Player
+                    Flips.append(i)
+        Count = len(Flips)-Start
+        if Count:
+            Flat[Index] = Player
+            Board[x][y] = Player
+        self.Stack.append(Index)
+        self.Stack.append(Count)
+        self.Player = Opponent
+        return Count
+
+    # to pass when the player to move has no possible move
+    def Pass(self):
+        self.Stack.append(0)
+        self.Stack.append(0)
+        self.Player = -1*self.Player
+
+    # to take back the last move or pass
+    def Undo(self):
+        Count = self.Stack.pop()
+        Index = self.Stack.pop()
+        self.Player = -1*self.Player
+        if Count:
+            Flat = self.Flat
+            Board = self.Board
+            Flips = self.Flips
+            Opponent = -1*self.Player
+            Flat[Index] = Empty
+            Board[Index // 10][Index % 10] = Empty
+            while Count:
+                i = Flips.pop()
+                Flat[i] = Opponent
+                Board[i // 10][i % 10] = Opponent
+                Count = Count-1
+
+    # the result as in PlayGame: the Black pieces more than the White ones
+    def Score(self):
+        return sum(self.Flat)
+
 # draw the board on screen
 def drawBoard(Board):
     Board1 = BoardCopy(Board)
@@ -152,7 +730,7 @@ def drawBoard(Board):
         print(HLINE)
 
 # to launch a game
-def PlayGame(PlayerWhite, PlayerBlack):
+def PlayGame(PlayerWhite, PlayerBlack, Hook=None, TraceMemory=False):
     '''
     Board, Result, TimeUsed, ErrorMessage = PlayGame(PlayerWhite, PlayerBlack)
 
@@ -171,35 +749,69 @@ def PlayGame(PlayerWhite, PlayerBlack):
     1001: Illegal Move, 1002: Player Function Error (Error message in "ErrorMessage"),
     1003: A Slow Player, 1004: No Legal Move
     the positive error codes are for PlayerWhite and the negative codes are
-    for PlayerBlack'''
+    for PlayerBlack. A move taking more than TimeLimit seconds, or a player
+    raising PlayerTimeout, is a slow player.
+
+    The players get a copy of the board made by BoardCopy, so a player may
+    change the board it is given. The copy costs about a microsecond.
+
+    Hook is called after every turn, a pass included, with a dict of the
+    turn: Colour, MoveNumber (from 1, the passes counted), Empties (before
+    the move), Move ((0,0) for a pass), WallTime and CPUTime (seconds) of
+    the player, PeakMemory and ErrCode. PeakMemory is the most memory in
+    bytes allocated by the player during the move when TraceMemory=True
+    (with tracemalloc, which slows the players down), otherwise None. The
+    CPU time and the memory of a player running in its own process, as a
+    SandboxPlayer, are not seen.'''
 
     InternalBoard = BoardInit()
     end = False
     PlayTime = [0, 0]
+    Turn = [0]
     error = ''
+    Tracing = Hook is not None and TraceMemory and not tracemalloc.is_tracing()
     def play(Colour, InternalBoard):
         ErrMessage = ''
         ErrCode = 0
+        time_used = 0
         a = PossibleMove(Colour, InternalBoard)
+        if Hook is not None:
+            Turn[0] = Turn[0]+1
+            Empties = sum(InternalBoard[x][1:9].count(Empty) for x in range(1, 9))
+            if TraceMemory:
+                tracemalloc.reset_peak()
+                MemoryStart = tracemalloc.get_traced_memory()[0]
+            CPUStart = time.process_time()
         if len(a) != 0:
             try:
                 StartTime = time.perf_counter()
                 if Colour == White:
-                    (x, y) = PlayerWhite(Colour, copy.deepcopy(InternalBoard))
+                    (x, y) = PlayerWhite(Colour, BoardCopy(InternalBoard))
                     time_used = time.perf_counter()-StartTime
                     PlayTime[0] = PlayTime[0]+time_used
                 else:
-                    (x, y) = PlayerBlack(Colour, copy.deepcopy(InternalBoard))
+                    (x, y) = PlayerBlack(Colour, BoardCopy(InternalBoard))
                     time_used = time.perf_counter()-StartTime
                     PlayTime[1] = PlayTime[1]+time_used
-                if time_used > 1.5:
+                if time_used > TimeLimit:
                     print(time_used)
                     ErrCode = PlayerSlow
                 if (x,y) in a:
                     InternalBoard = PlaceMove(Colour, InternalBoard, x, y)
                 else:
                     ErrCode = IllegalMove
+            except PlayerTimeout as e:
+                time_used = time.perf_counter()-StartTime
+                if Colour == White:
+                    PlayTime[0] = PlayTime[0]+time_used
+                else:
+                    PlayTime[1] = PlayTime[1]+time_used
+                ErrMessage = str(e)
+                ErrCode = PlayerSlow
+                (x, y) = (0, 0)
+                print(time_used)
             except Exception as e:
+                time_used = time.perf_counter()-StartTime
                 ErrMessage = str(e).replace('\x1b', '  ')
                 ErrCode = PlayerError
                 (x, y) = (0, 0)
@@ -207,26 +819,40 @@ def PlayGame(PlayerWhite, PlayerBlack):
         else:
             ErrCode = NoMove
             (x, y) = (0, 0)
+        if Hook is not None:
+            CPUTime = time.process_time()-CPUStart
+            PeakMemory = None
+            if TraceMemory:
+                PeakMemory = tracemalloc.get_traced_memory()[1]-MemoryStart
+            Hook({'Colour': Colour, 'MoveNumber': Turn[0], 'Empties': Empties,
+                  'Move': (x, y), 'WallTime': time_used, 'CPUTime': CPUTime,
+                  'PeakMemory': PeakMemory, 'ErrCode': ErrCode})
         return (x, y), ErrCode, ErrMessage, InternalBoard
 
-    while not(end):
-        (x, y), ErrCode, ErrMessage, InternalBoard = play(White, InternalBoard)
-        #drawBoard(InternalBoard)
-        if ErrCode != NoMove:
-            if ErrCode != 0:
-                return copy.deepcopy(InternalBoard), ErrCode, PlayTime, ErrMessage
-        else:
-            end = True
-        (x, y), ErrCode, ErrMessage, InternalBoard = play(Black, InternalBoard)
-        if ErrCode != NoMove:
-            if ErrCode != 0:
-                return copy.deepcopy(InternalBoard), -1*ErrCode, PlayTime, ErrMessage
-            end = False
+    if Tracing:
+        tracemalloc.start()
+    try:
+        while not(end):
+            (x, y), ErrCode, ErrMessage, InternalBoard = play(White, InternalBoard)
+            #drawBoard(InternalBoard)
+            if ErrCode != NoMove:
+                if ErrCode != 0:
+                    return BoardCopy(InternalBoard), ErrCode, PlayTime, ErrMessage
+            else:
+                end = True
+            (x, y), ErrCode, ErrMessage, InternalBoard = play(Black, InternalBoard)
+            if ErrCode != NoMove:
+                if ErrCode != 0:
+                    return BoardCopy(InternalBoard), -1*ErrCode, PlayTime, ErrMessage
+                end = False
             
-    result = 0
-    for x in range(1, 9):
-        result = result + sum(InternalBoard[x])
-    return copy.deepcopy(InternalBoard), result, PlayTime, error
+        result = 0
+        for x in range(1, 9):
+            result = result + sum(InternalBoard[x])
+        return BoardCopy(InternalBoard), result, PlayTime, error
+    finally:
+        if Tracing:
+            tracemalloc.stop()
 
 # a demo player function
 def player1(Colour, Board):
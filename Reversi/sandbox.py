@@ -0,0 +1,116 @@
+# Module for Python course project V3.0 2025
+# This module runs a player function in its own worker process, so that a
+# move can be cut off at the time limit instead of blocking the game
+
+from Reversi import *
+import importlib
+import multiprocessing
+import os, sys
+import time
+
+# time allowed for importing the player module in the worker process
+ImportLimit = 30
+
+# the main loop of the worker process
+def SandboxWorker(Path, Name, Connection):
+    '''To import the player function of the module Name from Path and send
+    ('ready', seconds of the import) on the Connection, then to answer
+    every (Colour, Board) received with ('move', (x,y)) or ('error', message)'''
+    sys.path.append(Path)
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        StartTime = time.perf_counter()
+        Function = importlib.import_module(Name).player
+        ImportTime = time.perf_counter()-StartTime
+    except Exception as e:
+        Connection.send(('error', str(e)))
+        return
+    Connection.send(('ready', ImportTime))
+    while True:
+        try:
+            (Colour, Board) = Connection.recv()
+        except EOFError:
+            return
+        try:
+            Connection.send(('move', Function(Colour, Board)))
+        except Exception as e:
+            Connection.send(('error', str(e)))
+
+# a player function running in a worker process
+class SandboxPlayer:
+    '''A player function (x,y) = SandboxPlayer(Colour, Board) which sends
+    every move to the player of the module Name running in a persistent
+    worker process. A move not answered within Deadline seconds raises
+    PlayerTimeout at once and the worker is restarted for the next call.
+    A player raising an exception or exiting is reported as an error.
+    ImportTime is the time the worker took to import the module.'''
+
+    def __init__(self, Path, Name, Deadline=TimeLimit):
+        self.Path = Path
+        self.Name = Name
+        self.Deadline = Deadline
+        self.Process = None
+        self.Connection = None
+        self.Ready = False
+        self.ImportTime = None
+
+    # to launch the worker process
+    def Launch(self):
+        '''To launch the worker process without waiting for the import'''
+        self.Stop()
+        (self.Connection, Child) = multiprocessing.Pipe()
+        self.Process = multiprocessing.Process(target=SandboxWorker,
+                                               args=(self.Path, self.Name, Child),
+                                               daemon=True)
+        self.Process.start()
+        Child.close()
+        self.Ready = False
+
+    # to launch the worker process and wait for the import
+    def Start(self, Limit=ImportLimit):
+        '''To launch the worker process, if not yet launched, and wait until
+        the player module is imported, at most Limit seconds. An import
+        error is raised here.'''
+        if self.Process is None:
+            self.Launch()
+        if self.Ready:
+            return
+        if not self.Connection.poll(Limit):
+            self.Stop()
+            raise Exception('%s is not imported in %.1f s' % (self.Name, Limit))
+        try:
+            (Kind, Value) = self.Connection.recv()
+        except EOFError:
+            (Kind, Value) = ('error', '%s exited while importing' % self.Name)
+        if Kind != 'ready':
+            self.Stop()
+            raise Exception(Value)
+        self.ImportTime = Value
+        self.Ready = True
+
+    # to stop the worker process
+    def Stop(self):
+        '''To terminate the worker process, if any'''
+        if self.Process is not None:
+            self.Connection.close()
+            self.Process.terminate()
+            self.Process.join()
+            self.Process = None
+            self.Connection = None
+
+    def __call__(self, Colour, Board):
+        self.Start()
+        self.Connection.send((Colour, Board))
+        if not self.Connection.poll(self.Deadline):
+            # the worker is busy with the late move, a new one is launched
+            # so that the import is done before the next call
+            self.Launch()
+            raise PlayerTimeout('no move from %s in %.1f s' % (self.Name, self.Deadline))
+        try:
+            (Kind, Value) = self.Connection.recv()
+        except EOFError:
+            self.Stop()
+            raise Exception('%s exited' % self.Name)
+        if Kind == 'error':
+            raise Exception(Value)
+        return Value
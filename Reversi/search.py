@@ -0,0 +1,344 @@
+# Module for Python course project V3.0 2025
+# This module provide an alpha-beta search to be shared by player functions
+# It searches on the bitboards of Reversi with iterative deepening, a
+# principal-variation search, a bounded transposition table and move
+# ordering, within a time budget below the TimeLimit of PlayGame
+
+from Reversi import *
+from endgame import Solver, EndgameTimeout, EndgameEmpties
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+
+# time used for one move by default, to stay clear of TimeLimit
+TimeBudget = TimeLimit*2/3
+
+# the value of a won game, more than any evaluation
+WinScore = 100000
+
+# the flags of the transposition table entries
+Exact, Lower, Upper = [0, 1, 2]
+
+# the static value of every cell, cell (x,y) is the bit (x-1)*8+(y-1)
+CellWeights = [100, -20, 10,  5,  5, 10, -20, 100,
+               -20, -50, -2, -2, -2, -2, -50, -20,
+                10,  -2, -1, -1, -1, -1,  -2,  10,
+                 5,  -2, -1, -1, -1, -1,  -2,   5,
+                 5,  -2, -1, -1, -1, -1,  -2,   5,
+                10,  -2, -1, -1, -1, -1,  -2,  10,
+               -20, -50, -2, -2, -2, -2, -50, -20,
+               100, -20, 10,  5,  5, 10, -20, 100]
+
+# the sum of CellWeights for every byte of every row, so that the value of
+# a bitboard is found with 8 lookups
+RowWeights = [[sum(CellWeights[x*8+y] for y in range(8) if Byte >> y & 1)
+               for Byte in range(256)] for x in range(8)]
+
+# the exception to stop a search at its deadline
+class SearchTimeout(Exception):
+    pass
+
+# to get the static value of the pieces of a bitboard
+def WeightSum(Bits):
+    '''To get the sum of CellWeights of the cells set in Bits'''
+    Value = 0
+    for x in range(8):
+        Value += RowWeights[x][(Bits >> (x*8)) & 0xFF]
+    return Value
+
+# the default evaluation
+def Evaluate(Own, Opp):
+    '''To evaluate the position for the player owning Own, to move: the
+    cell weights and the mobility of both sides'''
+    Mobility = BitCount(BitMoves(Own, Opp))-BitCount(BitMoves(Opp, Own))
+    return WeightSum(Own)-WeightSum(Opp)+5*Mobility
+
+# the value of a finished game
+def FinalScore(Own, Opp):
+    '''To get the value of a finished game for the player owning Own: a
+    win is worth WinScore plus the pieces more than the opponent'''
+    return DifferenceScore(BitCount(Own)-BitCount(Opp))
+
+# the value of a game finished with a difference of pieces
+def DifferenceScore(Difference):
+    '''To get the value of a game finished with Difference pieces more than
+    the opponent, as FinalScore'''
+    if Difference > 0:
+        return WinScore+Difference
+    elif Difference < 0:
+        return -WinScore+Difference
+    return 0
+
+# an alpha-beta searcher with its transposition table and history
+class Searcher:
+    '''An iterative deepening principal-variation search. The transposition
+    table holds 2**TableBits entries, an entry is replaced by any newer one.
+    Evaluate(Own, Opp) gives the value of a leaf for the player to move.
+    With Symmetric=True the table is keyed by the canonical position
+    (CanonicalBits) so that the symmetric positions share their entries.
+    Keep one Searcher for a whole game so that the table and the history
+    are used again at the next move. With EndgameEmpties or less empty
+    cells the endgame Solver is tried first with half of the budget.'''
+
+    def __init__(self, TableBits=16, Evaluate=Evaluate, Symmetric=False):
+        self.Symmetric = Symmetric
+        self.Mask = (1 << TableBits)-1
+        self.Table = [None]*(1 << TableBits)
+        self.History = [0]*64
+        self.Evaluate = Evaluate
+        self.Solver = Solver()
+        self.Nodes = 0
+        self.Depth = 0
+        self.Deadline = 0
+
+    # to put the moves in the order to search them
+    def Order(self, Moves, TableSquare):
+        '''To list the squares of Moves, the move of the transposition
+        table first, then by the history of the cutoffs they caused'''
+        Squares = []
+        while Moves:
+            Low = Moves & -Moves
+            Squares.append(Low.bit_length()-1)
+            Moves ^= Low
+        History = self.History
+        Squares.sort(key=lambda Square: -History[Square]-CellWeights[Square])
+        if TableSquare in Squares:
+            Squares.remove(TableSquare)
+            Squares.insert(0, TableSquare)
+        return Squares
+
+    # the principal-variation search
+    def PVS(self, Own, Opp, Depth, Alpha, Beta):
+        '''To get the value of the position for the player owning Own, to
+        move, searched Depth moves deep within the window (Alpha, Beta)'''
+        self.Nodes += 1
+        if self.Nodes & 255 == 0 and time.perf_counter() > self.Deadline:
+            raise SearchTimeout()
+        Moves = BitMoves(Own, Opp)
+        if not Moves:
+            if not BitMoves(Opp, Own):
+                return FinalScore(Own, Opp)
+            return -self.PVS(Opp, Own, Depth, -Beta, -Alpha)
+        if Depth == 0:
+            return self.Evaluate(Own, Opp)
+        if self.Symmetric:
+            (KeyOwn, KeyOpp, t) = CanonicalBits(Own, Opp)
+            Key = (KeyOwn, KeyOpp)
+        else:
+            Key = (Own, Opp)
+            t = 0
+        Slot = hash(Key) & self.Mask
+        Entry = self.Table[Slot]
+        TableSquare = -1
+        if Entry is not None and Entry[0] == Key:
+            (Key, EntryDepth, Flag, Value, TableSquare) = Entry
+            if t and TableSquare >= 0:
+                TableSquare = SymmetrySquare[SymmetryInverse[t]][TableSquare]
+            if EntryDepth >= Depth:
+                if Flag == Exact:
+                    return Value
+                if Flag == Lower and Value >= Beta:
+                    return Value
+                if Flag == Upper and Value <= Alpha:
+                    return Value
+        AlphaStart = Alpha
+        Best = -2*WinScore
+        BestSquare = -1
+        for Square in self.Order(Moves, TableSquare):
+            Flips = BitFlips(Own, Opp, Square)
+            NewOwn = Opp ^ Flips
+            NewOpp = Own | Flips | (1 << Square)
+            if BestSquare < 0:
+                Value = -self.PVS(NewOwn, NewOpp, Depth-1, -Beta, -Alpha)
+            else:
+                Value = -self.PVS(NewOwn, NewOpp, Depth-1, -Alpha-1, -Alpha)
+                if Alpha < Value < Beta:
+                    Value = -self.PVS(NewOwn, NewOpp, Depth-1, -Beta, -Value)
+            if Value > Best:
+                Best = Value
+                BestSquare = Square
+            if Value > Alpha:
+                Alpha = Value
+            if Alpha >= Beta:
+                self.History[Square] += Depth*Depth
+                break
+        if Best <= AlphaStart:
+            Flag = Upper
+        elif Best >= Beta:
+            Flag = Lower
+        else:
+            Flag = Exact
+        if t:
+            BestSquare = SymmetrySquare[t][BestSquare]
+        self.Table[Slot] = (Key, Depth, Flag, Best, BestSquare)
+        return Best
+
+    # to search the moves of the root position
+    def Root(self, Own, Opp, Squares, Depth):
+        '''To search the root moves Squares, in this order, Depth moves deep.
+        The return value is (Value, Square) of the best move.'''
+        Alpha = -2*WinScore
+        Beta = 2*WinScore
+        BestSquare = -1
+        for Square in Squares:
+            Flips = BitFlips(Own, Opp, Square)
+            NewOwn = Opp ^ Flips
+            NewOpp = Own | Flips | (1 << Square)
+            if BestSquare < 0:
+                Value = -self.PVS(NewOwn, NewOpp, Depth-1, -Beta, -Alpha)
+            else:
+                Value = -self.PVS(NewOwn, NewOpp, Depth-1, -Alpha-1, -Alpha)
+                if Value > Alpha:
+                    Value = -self.PVS(NewOwn, NewOpp, Depth-1, -Beta, -Value)
+            if BestSquare < 0 or Value > Alpha:
+                Alpha = Value
+                BestSquare = Square
+        return Alpha, BestSquare
+
+    # to search the best move of a position
+    def Search(self, Own, Opp, Budget=TimeBudget, MaxDepth=60):
+        '''To search the best move for the player owning Own by iterative
+        deepening until Budget seconds are used. The return value is
+        (Square, Value, Depth) of the last depth searched completely, the
+        Square is -1 when there is no possible move.'''
+        StartTime = time.perf_counter()
+        self.Deadline = StartTime+Budget
+        self.Nodes = 0
+        self.Depth = 0
+        Moves = BitMoves(Own, Opp)
+        if not Moves:
+            return -1, 0, 0
+        Empties = BitCount(~(Own | Opp) & BitFull)
+        if Empties <= EndgameEmpties:
+            try:
+                (Square, Difference) = self.Solver.BestMove(Own, Opp, Budget/2)
+                self.Depth = Empties
+                return Square, DifferenceScore(Difference), Empties
+            except EndgameTimeout:
+                pass
+        Results = self.Deepen(Own, Opp, self.Order(Moves, -1), StartTime, Budget, MaxDepth)
+        if not Results:
+            return self.Order(Moves, -1)[0], 0, 0
+        (Depth, Value, Square) = Results[-1]
+        return Square, Value, Depth
+
+    # the iterative deepening on some of the root moves
+    def Deepen(self, Own, Opp, Squares, StartTime, Budget, MaxDepth=60):
+        '''To search the root moves Squares with the depth growing by one
+        until the deadline StartTime+Budget. The return value is the list
+        of (Depth, Value, Square) of the best move at every depth searched
+        completely.'''
+        self.Deadline = StartTime+Budget
+        Squares = list(Squares)
+        Results = []
+        for Depth in range(1, MaxDepth+1):
+            try:
+                (Value, Square) = self.Root(Own, Opp, Squares, Depth)
+            except SearchTimeout:
+                break
+            Results.append((Depth, Value, Square))
+            self.Depth = Depth
+            # the best move is searched first at the next depth
+            Squares.remove(Square)
+            Squares.insert(0, Square)
+            # the game is decided, or the next depth would not be finished
+            if abs(Value) >= WinScore or \
+               time.perf_counter()-StartTime > Budget/3:
+                break
+        return Results
+
+# the searcher used by SearchMove
+DefaultSearcher = Searcher()
+
+# to search the best move for a player function
+def SearchMove(Colour, Board, Budget=TimeBudget, Searcher=None):
+    '''To get the best move (x,y) of the Colour on the Board found by the
+    alpha-beta search within Budget seconds, (0,0) when there is no
+    possible move. Searcher may also be a ParallelSearcher.'''
+    if Searcher is None:
+        Searcher = DefaultSearcher
+    Own, Opp = BoardToBits(Colour, Board)
+    (Square, Value, Depth) = Searcher.Search(Own, Opp, Budget)
+    if Square < 0:
+        return (0, 0)
+    return BitCell[Square]
+
+# the searcher of a worker process of ParallelSearcher
+WorkerSearcher = None
+
+# to create the searcher of a worker process
+def WorkerInit(TableBits):
+    global WorkerSearcher
+    WorkerSearcher = Searcher(TableBits)
+
+# to search some of the root moves in a worker process
+def WorkerSearch(Own, Opp, Squares, Deadline, MaxDepth):
+    '''To search the root moves Squares until the wall-clock Deadline,
+    as Searcher.Deepen'''
+    StartTime = time.perf_counter()
+    Budget = Deadline-time.time()
+    return WorkerSearcher.Deepen(Own, Opp, Squares, StartTime, Budget, MaxDepth)
+
+# a search splitting the root moves over worker processes
+class ParallelSearcher:
+    '''A search using Workers processes, which stay alive between the
+    moves with their own Searcher (and transposition table). The root
+    moves are dealt out to the workers, each one deepens its moves until
+    the deadline, and the best move is taken at the deepest depth finished
+    by every worker. The endgame is solved here by a local Searcher.'''
+
+    def __init__(self, Workers=None, TableBits=16):
+        if Workers is None:
+            Workers = os.cpu_count() or 1
+        self.Workers = Workers
+        self.Pool = ProcessPoolExecutor(Workers, initializer=WorkerInit,
+                                        initargs=(TableBits,))
+        self.Local = Searcher(TableBits)
+        self.Depth = 0
+
+    # to stop the worker processes
+    def Close(self):
+        self.Pool.shutdown()
+
+    # to search the best move of a position
+    def Search(self, Own, Opp, Budget=TimeBudget, MaxDepth=60):
+        '''To search the best move for the player owning Own within Budget
+        seconds. The return value is (Square, Value, Depth) as for
+        Searcher.Search.'''
+        Deadline = time.time()+Budget
+        Moves = BitMoves(Own, Opp)
+        if not Moves:
+            return -1, 0, 0
+        Squares = self.Local.Order(Moves, -1)
+        if len(Squares) == 1 or BitCount(~(Own | Opp) & BitFull) <= EndgameEmpties:
+            Result = self.Local.Search(Own, Opp, Budget, MaxDepth)
+            self.Depth = self.Local.Depth
+            return Result
+        Jobs = []
+        for Worker in range(min(self.Workers, len(Squares))):
+            Jobs.append(self.Pool.submit(WorkerSearch, Own, Opp, Squares[Worker::self.Workers],
+                                         Deadline, MaxDepth))
+        Results = [Job.result() for Job in Jobs]
+        Depth = min(len(Result) for Result in Results)
+        self.Depth = Depth
+        if Depth == 0:
+            return Squares[0], 0, 0
+        (Value, Square) = max((Result[Depth-1][1], Result[Depth-1][2]) for Result in Results)
+        return Square, Value, Depth
+
+# the parallel searcher used by ParallelSearchMove, created at the first call
+DefaultParallelSearcher = None
+
+# to search the best move for a player function on all processors
+def ParallelSearchMove(Colour, Board, Budget=TimeBudget):
+    '''As SearchMove, with the root moves searched by the worker processes
+    of a ParallelSearcher'''
+    global DefaultParallelSearcher
+    if DefaultParallelSearcher is None:
+        DefaultParallelSearcher = ParallelSearcher()
+    return SearchMove(Colour, Board, Budget, DefaultParallelSearcher)
+
+# a player function using the search
+def player(Colour, Board):
+    '''A player function searching every move with SearchMove'''
+    return SearchMove(Colour, Board)